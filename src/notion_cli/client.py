@@ -1,13 +1,153 @@
 """Notion API client wrapper."""
 
+import asyncio
+import heapq
+import json
 import os
-from typing import Any
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from types import ModuleType
+from typing import Any, NamedTuple
 
-from notion_client import Client
-from notion_client.errors import APIResponseError
+from httpx import Response
+from notion_client import AsyncClient, Client
+from notion_client.errors import APIErrorCode, APIResponseError
 
 from .config import ConfigManager
 
+orjson: ModuleType | None
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Upper bound on in-flight requests for concurrent operations. This caps
+# concurrency, not request rate: requests that still exceed Notion's average
+# limit of ~3 per second are answered with 429 and retried after a delay.
+MAX_CONCURRENT_REQUESTS = 3
+
+# Times a rate-limited request is retried, and the first fallback delay in
+# seconds (doubled per attempt) when Notion sends no Retry-After header
+MAX_RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_BACKOFF = 1.0
+
+# API errors that can mean a cached database object is out of date, e.g. the
+# database was deleted or unshared, or its properties changed
+_STALE_DATABASE_ERRORS = frozenset({APIErrorCode.ObjectNotFound, APIErrorCode.ValidationError})
+
+# Shared stand-in for missing properties; never mutated
+_EMPTY: dict[str, Any] = {}
+
+
+def _plain_text(rich_text: list[dict[str, Any]]) -> str:
+    """Join the plain text of a rich text array."""
+    return "".join([t.get("plain_text", "") for t in rich_text])
+
+
+def _date_value(date: dict[str, Any]) -> str:
+    """Format a date property value, including its end date if any."""
+    start = date.get("start", "")
+    end = date.get("end", "")
+    return f"{start}" + (f" → {end}" if end else "")
+
+
+def _url_value(url: str) -> str:
+    """Format a URL as a link showing its domain."""
+    # Extract domain name for display
+    try:
+        from urllib.parse import urlparse
+
+        parsed = urlparse(url)
+        domain = parsed.netloc or url
+        return f"[link={url}]{domain}[/link]"
+    except Exception:
+        return url
+
+
+def _files_value(files: list[dict[str, Any]]) -> str:
+    """Format a files property value."""
+    if len(files) > 1:
+        # Multiple files - show count and first file name
+        first_name = files[0].get("name", "File")
+        return f"{first_name} (+{len(files) - 1} more)"
+
+    # Show single file with name and link
+    file_obj = files[0]
+    file_type = file_obj.get("type")
+    name = str(file_obj.get("name", "File"))
+    if file_type not in ("external", "file"):
+        return name
+
+    # External or Notion-hosted file - show name and URL
+    url = file_obj.get(file_type, {}).get("url", "")
+    return f"[link={url}]{name}[/link]" if url else name
+
+
+# Readable-value formatters keyed by Notion property type, called with the
+# type-specific payload of a property (e.g. property_data["select"])
+_VALUE_EXTRACTORS: dict[str, Callable[[Any], str]] = {
+    "title": _plain_text,
+    "rich_text": _plain_text,
+    "number": str,
+    "select": lambda select: select.get("name", ""),
+    "multi_select": lambda options: ", ".join([s.get("name", "") for s in options]),
+    "date": _date_value,
+    "checkbox": lambda checked: "✓" if checked else "✗",
+    "url": _url_value,
+    "email": lambda email: f"[link=mailto:{email}]{email}[/link]",
+    "phone_number": lambda phone: phone,
+    "people": lambda people: ", ".join([p.get("name", "") for p in people]),
+    "files": _files_value,
+    "status": lambda status: status.get("name", ""),
+}
+
+# Property types whose falsy payloads (0, False) are still meaningful values
+_FALSY_VALUE_TYPES = frozenset({"number", "checkbox"})
+
+
+def _extract_value(
+    property_data: dict[str, Any],
+    prop_type: str,
+    extractor: Callable[[Any], str] | None,
+) -> str:
+    """Format a property's payload with its type's extractor, if it has a value."""
+    value = property_data.get(prop_type)
+    has_value = value is not None if prop_type in _FALSY_VALUE_TYPES else bool(value)
+    if extractor is not None and has_value:
+        return extractor(value)
+    return str(property_data.get(prop_type, ""))[:50]  # Truncate long values
+
+
+def _retry_delay(response: Response, attempt: int) -> float:
+    """Seconds to wait before retrying a rate-limited request."""
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return RATE_LIMIT_BACKOFF * 2**attempt
+
+
+class StaleDatabaseError(Exception):
+    """Raised when a request fails because a cached database object was out of date."""
+
+
+class PageResult(NamedTuple):
+    """A page of query results and whether Notion has more after it."""
+
+    entries: list[dict[str, Any]]
+    has_more: bool
+    next_cursor: str | None
+
+
+class _NotionClient(Client):
+    """Notion client that decodes successful responses with orjson when available."""
+
+    def _parse_response(self, response: Response) -> Any:
+        """Decode a response body, deferring errors to the base client."""
+        if orjson is None or response.is_error:
+            return super()._parse_response(response)
+        return orjson.loads(response.content)
+
 
 class NotionClientWrapper:
     """Wrapper around the official Notion client with additional functionality."""
@@ -23,8 +163,25 @@ class NotionClientWrapper:
                 "Run 'notion auth setup --token <your-token>' first.",
             )
 
-        self.client = Client(auth=config.integration_token)
+        self.client = _NotionClient(auth=config.integration_token)
         self.config = config
+        # Unfiltered database and page listings, reused within this process
+        self._databases: list[dict[str, Any]] | None = None
+        self._pages: list[dict[str, Any]] | None = None
+        # Databases found by name, keyed by lowercased name
+        self._databases_by_name: dict[str, dict[str, Any]] = {}
+        # IDs of databases served from the on-disk cache, which may be out of date,
+        # and of those found stale, whose cache entries are ignored even if the
+        # eviction could not be written to disk
+        self._disk_cached_database_ids: set[str] = set()
+        self._stale_database_ids: set[str] = set()
+        # Page titles (page, title, lowercased title) and pages keyed by
+        # lowercased title, built on the first name lookup and then reused
+        self._page_titles: list[tuple[dict[str, Any], str, str]] | None = None
+        self._title_index: dict[str, list[tuple[dict[str, Any], str]]] | None = None
+        # HTTP session for file uploads, created on first upload so its
+        # connections are reused across files
+        self._upload_session: Any = None
 
     def test_connection(self) -> bool:
         """Test if the connection to Notion is working."""
@@ -35,44 +192,84 @@ class NotionClientWrapper:
             return False
 
     def list_databases(self) -> list[dict[str, Any]]:
-        """List all accessible databases."""
+        """List all accessible databases, using recently cached results when possible."""
+        if self._databases is None:
+            self._databases = self.config_manager.get_cached_search("databases")
+        if self._databases is not None:
+            return self._databases
+
         try:
             response = self.client.search(
                 filter={"property": "object", "value": "database"},
             )
-            return response.get("results", [])
         except APIResponseError as e:
             raise Exception(f"Failed to list databases: {e}")
 
+        self._databases = response.get("results", [])
+        self.config_manager.cache_search("databases", self._databases)
+        return self._databases
+
     def get_database_by_name(self, name: str) -> dict[str, Any] | None:
-        """Get a database by its title."""
+        """Get a database by its title, using the on-disk cache when possible."""
+        key = name.lower()
+        if key in self._databases_by_name:
+            return self._databases_by_name[key]
+
+        cached = self.config_manager.get_cached_database(name)
+        if cached and cached.get("id") not in self._stale_database_ids:
+            self._databases_by_name[key] = cached
+            self._disk_cached_database_ids.add(cached.get("id", ""))
+            return cached
+
         databases = self.list_databases()
 
         for db in databases:
-            db_title = ""
-            if "title" in db and db["title"]:
-                if isinstance(db["title"], list) and db["title"]:
-                    db_title = db["title"][0].get("plain_text", "")
-                elif isinstance(db["title"], str):
-                    db_title = db["title"]
-
-            if db_title.lower() == name.lower():
+            db_title = self.get_database_title(db, default="")
+
+            if db_title.lower() == key:
+                self.config_manager.cache_database(name, db)
+                self._databases_by_name[key] = db
                 return db
 
         return None
 
+    def _evict_stale_database(self, database_id: str, error: APIResponseError) -> bool:
+        """Drop a database served from the on-disk cache after an error suggesting it is stale.
+
+        Returns whether anything was evicted, i.e. whether a fresh lookup may help.
+        """
+        if error.code not in _STALE_DATABASE_ERRORS:
+            return False
+        if database_id not in self._disk_cached_database_ids:
+            return False
+
+        self._disk_cached_database_ids.discard(database_id)
+        self._stale_database_ids.add(database_id)
+        self._databases_by_name = {
+            key: db for key, db in self._databases_by_name.items() if db.get("id") != database_id
+        }
+        # The listing may still carry the old title, so fetch it afresh too
+        self._databases = None
+        self.config_manager.evict_cached_database(database_id)
+        self.config_manager.clear_search_cache()
+        return True
+
+    def get_database_title(self, database: dict[str, Any], default: str = "Untitled") -> str:
+        """Extract the title of a database object."""
+        title = database.get("title")
+        if isinstance(title, list) and title:
+            return title[0].get("plain_text", default)
+        if isinstance(title, str) and title:
+            return title
+        return default
+
     def find_databases_by_prefix(self, prefix: str) -> list[tuple[str, dict[str, Any]]]:
         """Find databases that start with the given prefix."""
         databases = self.list_databases()
         matches = []
 
         for db in databases:
-            db_title = ""
-            if "title" in db and db["title"]:
-                if isinstance(db["title"], list) and db["title"]:
-                    db_title = db["title"][0].get("plain_text", "")
-                elif isinstance(db["title"], str):
-                    db_title = db["title"]
+            db_title = self.get_database_title(db, default="")
 
             if db_title.lower().startswith(prefix.lower()):
                 matches.append((db_title, db))
@@ -167,6 +364,8 @@ class NotionClientWrapper:
 
             return self.client.databases.query(database_id=database_id, **query_params)
         except APIResponseError as e:
+            if self._evict_stale_database(database_id, e):
+                raise StaleDatabaseError(f"Cached database {database_id} is out of date: {e}")
             raise Exception(f"Failed to query database {database_id}: {e}")
 
     def create_page(
@@ -176,13 +375,18 @@ class NotionClientWrapper:
     ) -> dict[str, Any]:
         """Create a new page in a database."""
         try:
-            return self.client.pages.create(
+            page = self.client.pages.create(
                 parent={"database_id": database_id},
                 properties=properties,
             )
         except APIResponseError as e:
+            # Make the next lookup fetch the database afresh if its schema changed
+            self._evict_stale_database(database_id, e)
             raise Exception(f"Failed to create page in database {database_id}: {e}")
 
+        self._invalidate_pages()
+        return page
+
     def create_page_in_page(
         self,
         parent_page_id: str | None,
@@ -195,7 +399,7 @@ class NotionClientWrapper:
             if parent_page_id:
                 parent = {"page_id": parent_page_id}
 
-            return self.client.pages.create(
+            page = self.client.pages.create(
                 parent=parent,
                 properties={"title": {"title": [{"text": {"content": title}}]}},
                 children=children,
@@ -203,6 +407,16 @@ class NotionClientWrapper:
         except APIResponseError as e:
             raise Exception(f"Failed to create page: {e}")
 
+        self._invalidate_pages()
+        return page
+
+    def _invalidate_pages(self) -> None:
+        """Drop cached page listings after the workspace's pages change."""
+        self._pages = None
+        self._page_titles = None
+        self._title_index = None
+        self.config_manager.clear_search_cache()
+
     def update_page(self, page_id: str, properties: dict[str, Any]) -> dict[str, Any]:
         """Update an existing page."""
         try:
@@ -210,6 +424,74 @@ class NotionClientWrapper:
         except APIResponseError as e:
             raise Exception(f"Failed to update page {page_id}: {e}")
 
+    async def update_page_async(
+        self,
+        async_client: AsyncClient,
+        page_id: str,
+        body: bytes,
+    ) -> dict[str, Any]:
+        """Update an existing page with a pre-serialized JSON request body."""
+        # Send through the client's pooled HTTP session so the body is not
+        # re-encoded for every page
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            response = await async_client.client.patch(
+                f"pages/{page_id}",
+                content=body,
+                headers={"Content-Type": "application/json"},
+            )
+            if response.status_code != 429 or attempt == MAX_RATE_LIMIT_RETRIES:
+                break
+            await asyncio.sleep(_retry_delay(response, attempt))
+
+        if not response.is_error:
+            # Notion returns the updated page object as a JSON object
+            page: dict[str, Any] = (
+                orjson.loads(response.content) if orjson is not None else response.json()
+            )
+            return page
+
+        # Raise the same error the synchronous update_page does
+        try:
+            async_client._parse_response(response)
+        except APIResponseError as e:
+            raise Exception(f"Failed to update page {page_id}: {e}")
+        raise Exception(f"Failed to update page {page_id}: HTTP {response.status_code}")
+
+    def bulk_update_pages(
+        self,
+        page_ids: list[str],
+        properties: dict[str, Any],
+    ) -> list[Exception | None]:
+        """Apply the same property updates to several pages concurrently.
+
+        Returns one entry per page ID, holding the exception raised for that
+        page or None if the update succeeded.
+        """
+        payload = {"properties": properties}
+        body = orjson.dumps(payload) if orjson is not None else json.dumps(payload).encode()
+        return asyncio.run(self._bulk_update_pages(page_ids, body))
+
+    async def _bulk_update_pages(
+        self,
+        page_ids: list[str],
+        body: bytes,
+    ) -> list[Exception | None]:
+        """Dispatch page updates concurrently, bounded by MAX_CONCURRENT_REQUESTS."""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+        async with AsyncClient(auth=self.config.integration_token) as async_client:
+
+            async def bounded_update(page_id: str) -> dict[str, Any]:
+                async with semaphore:
+                    return await self.update_page_async(async_client, page_id, body)
+
+            results = await asyncio.gather(
+                *(bounded_update(page_id) for page_id in page_ids),
+                return_exceptions=True,
+            )
+
+        return [result if isinstance(result, Exception) else None for result in results]
+
     def delete_page(self, page_id: str) -> dict[str, Any]:
         """Delete a page (archive it)."""
         try:
@@ -224,8 +506,27 @@ class NotionClientWrapper:
         filter_conditions: dict[str, Any] | None = None,
     ) -> list[dict[str, Any]]:
         """Get entries from a database with pagination support."""
+        return list(self.iter_database_entries(database_id, limit, filter_conditions))
+
+    def iter_database_entries(
+        self,
+        database_id: str,
+        limit: int | None = None,
+        filter_conditions: dict[str, Any] | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield entries from a database one API page at a time."""
+        for page in self.iter_database_pages(database_id, limit, filter_conditions):
+            yield from page.entries
+
+    def iter_database_pages(
+        self,
+        database_id: str,
+        limit: int | None = None,
+        filter_conditions: dict[str, Any] | None = None,
+    ) -> Iterator[PageResult]:
+        """Yield pages of database entries along with Notion's pagination state."""
         try:
-            all_entries = []
+            fetched = 0
             start_cursor = None
 
             while True:
@@ -234,7 +535,7 @@ class NotionClientWrapper:
                 if limit is None:
                     page_size = 100  # Notion API max per page
                 else:
-                    remaining = limit - len(all_entries)
+                    remaining = limit - fetched
                     if remaining <= 0:
                         break
                     page_size = min(100, remaining)
@@ -247,21 +548,19 @@ class NotionClientWrapper:
                 )
 
                 entries = response.get("results", [])
-                all_entries.extend(entries)
+                has_more = response.get("has_more", False)
+                start_cursor = response.get("next_cursor")
+                if limit is not None and len(entries) > limit - fetched:
+                    entries = entries[: limit - fetched]
+                    has_more = True
+                fetched += len(entries)
+                yield PageResult(entries, has_more and bool(start_cursor), start_cursor)
 
                 # Check if there are more pages
-                if not response.get("has_more", False):
-                    break
-
-                start_cursor = response.get("next_cursor")
-                if not start_cursor:
+                if not has_more or not start_cursor:
                     break
-
-            # Apply limit if specified
-            if limit is not None:
-                return all_entries[:limit]
-            else:
-                return all_entries
+        except StaleDatabaseError:
+            raise
         except Exception as e:
             raise Exception(f"Failed to get entries from database {database_id}: {e}")
 
@@ -271,76 +570,25 @@ class NotionClientWrapper:
             return ""
 
         prop_type = property_data.get("type", "")
+        return _extract_value(property_data, prop_type, _VALUE_EXTRACTORS.get(prop_type))
 
-        if prop_type == "title" and property_data.get("title"):
-            return "".join([t.get("plain_text", "") for t in property_data["title"]])
-        elif prop_type == "rich_text" and property_data.get("rich_text"):
-            rich_text = property_data["rich_text"]
-            return "".join([t.get("plain_text", "") for t in rich_text])
-        elif prop_type == "number" and property_data.get("number") is not None:
-            return str(property_data["number"])
-        elif prop_type == "select" and property_data.get("select"):
-            return property_data["select"].get("name", "")
-        elif prop_type == "multi_select" and property_data.get("multi_select"):
-            return ", ".join([s.get("name", "") for s in property_data["multi_select"]])
-        elif prop_type == "date" and property_data.get("date"):
-            start = property_data["date"].get("start", "")
-            end = property_data["date"].get("end", "")
-            return f"{start}" + (f" → {end}" if end else "")
-        elif prop_type == "checkbox":
-            return "✓" if property_data.get("checkbox", False) else "✗"
-        elif prop_type == "url" and property_data.get("url"):
-            url = property_data["url"]
-            # Extract domain name for display
-            try:
-                from urllib.parse import urlparse
-
-                parsed = urlparse(url)
-                domain = parsed.netloc or url
-                return f"[link={url}]{domain}[/link]"
-            except Exception:
-                return url
-        elif prop_type == "email" and property_data.get("email"):
-            email = property_data["email"]
-            return f"[link=mailto:{email}]{email}[/link]"
-        elif prop_type == "phone_number" and property_data.get("phone_number"):
-            return property_data["phone_number"]
-        elif prop_type == "people" and property_data.get("people"):
-            return ", ".join([p.get("name", "") for p in property_data["people"]])
-        elif prop_type == "files" and property_data.get("files"):
-            files = property_data["files"]
-            if not files:
-                return "—"
-            elif len(files) == 1:
-                # Show single file with name and link
-                file_obj = files[0]
-                if file_obj.get("type") == "external":
-                    # External file - show name and URL
-                    name = file_obj.get("name", "File")
-                    url = file_obj.get("external", {}).get("url", "")
-                    if url:
-                        return f"[link={url}]{name}[/link]"
-                    else:
-                        return name
-                elif file_obj.get("type") == "file":
-                    # Notion-hosted file - show name and URL
-                    name = file_obj.get("name", "File")
-                    url = file_obj.get("file", {}).get("url", "")
-                    if url:
-                        return f"[link={url}]{name}[/link]"
-                    else:
-                        return name
-                else:
-                    return file_obj.get("name", "File")
-            else:
-                # Multiple files - show count and first file name
-                first_file = files[0]
-                first_name = first_file.get("name", "File")
-                return f"{first_name} (+{len(files) - 1} more)"
-        elif prop_type == "status" and property_data.get("status"):
-            return property_data["status"].get("name", "")
-        else:
-            return str(property_data.get(prop_type, ""))[:50]  # Truncate long values
+    def property_value_extractor(self, prop_type: str) -> Callable[[dict[str, Any]], str]:
+        """Return a value extractor specialized for properties of one type."""
+        extractor = _VALUE_EXTRACTORS.get(prop_type)
+
+        def extract(property_data: dict[str, Any]) -> str:
+            if not property_data:
+                return ""
+            return _extract_value(property_data, prop_type, extractor)
+
+        return extract
+
+    def extract_column_values(
+        self, entry_properties: list[dict[str, Any]], prop_name: str, prop_type: str
+    ) -> list[str]:
+        """Extract one property's display values from each entry's properties in a single pass."""
+        extract = self.property_value_extractor(prop_type)
+        return [extract(properties.get(prop_name, _EMPTY)) for properties in entry_properties]
 
     def prioritize_columns(self, properties: dict[str, Any]) -> list[str]:
         """Prioritize columns based on importance and type."""
@@ -505,9 +753,11 @@ class NotionClientWrapper:
                 f"File size ({file_size} bytes) exceeds 20MB limit for single-part upload",
             )
 
+        session = self._get_upload_session()
+
         try:
             # Step 1: Create file upload object
-            create_response = requests.post(
+            create_response = session.post(
                 "https://api.notion.com/v1/file_uploads",
                 json={"filename": file_name},
                 headers={
@@ -528,7 +778,7 @@ class NotionClientWrapper:
                     mime_type = "application/octet-stream"
 
                 files = {"file": (file_name, f, mime_type)}
-                upload_response = requests.post(
+                upload_response = session.post(
                     f"https://api.notion.com/v1/file_uploads/{file_upload_id}/send",
                     headers={
                         "Authorization": f"Bearer {self.config.integration_token}",
@@ -555,6 +805,14 @@ class NotionClientWrapper:
         except Exception as e:
             raise ValueError(f"Unexpected error during file upload: {e}")
 
+    def _get_upload_session(self) -> Any:
+        """Get the shared HTTP session for file uploads, creating it on first use."""
+        if self._upload_session is None:
+            import requests
+
+            self._upload_session = requests.Session()
+        return self._upload_session
+
     def prepare_file_properties(
         self,
         files: list[str],
@@ -564,15 +822,18 @@ class NotionClientWrapper:
         if not files:
             return {}
 
+        # Create the shared session before uploads fan out to worker threads,
+        # so they never race to create (and leak) sessions of their own
+        self._get_upload_session()
+
         file_objects = []
-        for file_path in files:
-            try:
-                file_obj = self.upload_file(file_path)
-                file_objects.append(file_obj)
-                print(f"✅ Uploaded: {os.path.basename(file_path)}")
-            except Exception as e:
-                print(f"❌ Failed to upload {os.path.basename(file_path)}: {e}")
+        results = self._upload_files(files)
+        for file_path, result in zip(files, results, strict=True):
+            if isinstance(result, Exception):
+                print(f"❌ Failed to upload {os.path.basename(file_path)}: {result}")
                 continue
+            file_objects.append(result)
+            print(f"✅ Uploaded: {os.path.basename(file_path)}")
 
         if not file_objects:
             return {}
@@ -584,86 +845,152 @@ class NotionClientWrapper:
 
         return result
 
+    def _upload_files(self, files: list[str]) -> list[dict[str, Any] | Exception]:
+        """Upload files concurrently, bounded by MAX_CONCURRENT_REQUESTS."""
+
+        def upload(file_path: str) -> dict[str, Any] | Exception:
+            # Return failures so one bad file does not abort the others
+            try:
+                return self.upload_file(file_path)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            return list(executor.map(upload, files))
+
     def search_pages(self, query: str = "") -> list[dict[str, Any]]:
-        """Search for pages in the workspace."""
-        try:
-            search_params = {"filter": {"property": "object", "value": "page"}}
+        """Search for pages in the workspace, caching the unfiltered page list."""
+        if not query and self._pages is None:
+            self._pages = self.config_manager.get_cached_search("pages")
+        if not query and self._pages is not None:
+            return self._pages
+        return list(self.iter_search_pages(query))
+
+    def iter_search_pages(self, query: str = "") -> Iterator[dict[str, Any]]:
+        """Yield pages from the workspace as each batch of search results arrives."""
+        if not query and self._pages is not None:
+            yield from self._pages
+            return
+
+        search_params: dict[str, Any] = {"filter": {"property": "object", "value": "page"}}
+        if query:
+            search_params["query"] = query
+
+        results = []
+        start_cursor = None
+        while True:
+            try:
+                response = self.client.search(**search_params, start_cursor=start_cursor)
+            except APIResponseError as e:
+                raise Exception(f"Failed to search pages: {e}")
 
-            if query:
-                search_params["query"] = query
+            batch = response.get("results", [])
+            results.extend(batch)
+            yield from batch
 
-            response = self.client.search(**search_params)
-            return response.get("results", [])
-        except APIResponseError as e:
-            raise Exception(f"Failed to search pages: {e}")
+            start_cursor = response.get("next_cursor")
+            if not response.get("has_more") or not start_cursor:
+                break
 
-    def get_page_by_name(self, name: str, fuzzy: bool = True) -> list[dict[str, Any]]:
-        """Get pages by name with optional fuzzy matching."""
-        all_pages = self.search_pages()
+        # Only a fully consumed listing is complete enough to cache
+        if not query:
+            self._pages = results
+            self.config_manager.cache_search("pages", results)
 
-        if not all_pages:
-            return []
+    def get_page_by_name(
+        self,
+        name: str,
+        fuzzy: bool = True,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Get pages by name with optional fuzzy matching, best matches first."""
+        pages, _ = self.rank_pages_by_name(name, fuzzy, limit)
+        return pages
 
-        matching_pages = []
-        name_lower = name.lower()
+    def rank_pages_by_name(
+        self,
+        name: str,
+        fuzzy: bool = True,
+        limit: int | None = None,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """Get the best matching pages by name along with the total number of matches."""
+        if not fuzzy:
+            # Exact matches all score 1.0, so a title lookup replaces scoring
+            exact_matches = self._get_title_index().get(name.lower(), [])
+            pages = [
+                {**page, "_title": page_title, "_match_score": 1.0}
+                for page, page_title in exact_matches[:limit]
+            ]
+            return pages, len(exact_matches)
 
-        for page in all_pages:
-            page_title = self._extract_page_title(page)
-            page_title_lower = page_title.lower()
+        matches = []
+        name_lower = name.lower()
 
-            if fuzzy:
-                # Fuzzy matching - check if query is contained in title
-                if name_lower in page_title_lower:
-                    matching_pages.append(
-                        {
-                            **page,
-                            "_title": page_title,
-                            "_match_score": self._calculate_match_score(
-                                name_lower,
-                                page_title_lower,
-                            ),
-                        },
-                    )
-            else:
-                # Exact matching
-                if page_title_lower == name_lower:
-                    matching_pages.append(
-                        {**page, "_title": page_title, "_match_score": 1.0},
-                    )
+        for page, page_title, page_title_lower in self._get_page_titles():
+            # Fuzzy matching - check if query is contained in title
+            if name_lower in page_title_lower:
+                score = self._calculate_match_score(name_lower, page_title_lower)
+                matches.append((score, page, page_title))
 
-        # Sort by match score (higher is better)
-        matching_pages.sort(key=lambda x: x["_match_score"], reverse=True)
-        return matching_pages
+        # Rank by match score (higher is better), selecting only the top
+        # results when limited instead of sorting every match
+        if limit is None:
+            ranked = sorted(matches, key=itemgetter(0), reverse=True)
+        else:
+            ranked = heapq.nlargest(limit, matches, key=itemgetter(0))
+
+        pages = [
+            {**page, "_title": page_title, "_match_score": score}
+            for score, page, page_title in ranked
+        ]
+        return pages, len(matches)
+
+    def _get_page_titles(self) -> list[tuple[dict[str, Any], str, str]]:
+        """Get every page with its title and lowercased title, searching the workspace once."""
+        if self._page_titles is None:
+            self._page_titles = []
+            for page in self.search_pages():
+                page_title = self._extract_page_title(page)
+                self._page_titles.append((page, page_title, page_title.lower()))
+        return self._page_titles
+
+    def _get_title_index(self) -> dict[str, list[tuple[dict[str, Any], str]]]:
+        """Get pages grouped by lowercased title."""
+        if self._title_index is None:
+            index: dict[str, list[tuple[dict[str, Any], str]]] = {}
+            for page, page_title, page_title_lower in self._get_page_titles():
+                index.setdefault(page_title_lower, []).append((page, page_title))
+            self._title_index = index
+        return self._title_index
 
     def _extract_page_title(self, page: dict[str, Any]) -> str:
         """Extract title from a page object."""
         properties = page.get("properties", {})
 
         # Look for title property
-        for _prop_name, prop_data in properties.items():
+        for prop_data in properties.values():
             if prop_data.get("type") == "title":
-                title_content = prop_data.get("title", [])
+                title_content = prop_data.get("title")
                 if title_content:
                     return title_content[0].get("plain_text", "Untitled")
 
-        # Fallback to page title in root
-        if "title" in page and page["title"]:
-            if isinstance(page["title"], list) and page["title"]:
-                return page["title"][0].get("plain_text", "Untitled")
-            elif isinstance(page["title"], str):
-                return page["title"]
-
-        return "Untitled"
+        # Fallback to page title in root, which is shaped like a database title
+        return self.get_database_title(page)
 
     def _calculate_match_score(self, query: str, title: str) -> float:
         """Calculate a simple match score for fuzzy search."""
-        if query == title:
-            return 1.0
+        query_len = len(query)
+        title_len = len(title)
+        # Compare lengths first so mismatches skip the string scans
+        if title_len < query_len:
+            return 0.0
+        elif title_len == query_len:
+            return 1.0 if query == title else 0.0
         elif title.startswith(query):
             return 0.9
         elif query in title:
             # Score based on how much of the title matches
-            return len(query) / len(title)
+            return query_len / title_len
         else:
             return 0.0
 
@@ -688,25 +1015,31 @@ class NotionClientWrapper:
         database_name: str,
         entry_name: str,
         fuzzy: bool = True,
+        limit: int | None = None,
     ) -> list[dict[str, Any]]:
         """Get database entries by searching for a specific name/title."""
+        entries, _ = self.rank_database_entries_by_name(database_name, entry_name, fuzzy, limit)
+        return entries
+
+    def rank_database_entries_by_name(
+        self,
+        database_name: str,
+        entry_name: str,
+        fuzzy: bool = True,
+        limit: int | None = None,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """Get the best matching entries by name along with the total number of matches."""
         database = self.get_database_by_name(database_name)
         if not database:
             raise ValueError(f"Database '{database_name}' not found")
 
         database_id = database.get("id", "")
-        database.get("properties", {})
-
-        # Get all entries
-        all_entries = self.get_database_entries(database_id)
-
-        if not all_entries:
-            return []
 
-        matching_entries = []
+        matches = []
         entry_name_lower = entry_name.lower()
 
-        for entry in all_entries:
+        # Scan entries page by page so only matches are kept in memory
+        for entry in self.iter_database_entries(database_id):
             entry_properties = entry.get("properties", {})
 
             # Look for title-like properties
@@ -716,26 +1049,25 @@ class NotionClientWrapper:
             if fuzzy:
                 # Fuzzy matching - check if query is contained in title
                 if entry_name_lower in entry_title_lower:
-                    matching_entries.append(
-                        {
-                            **entry,
-                            "_title": entry_title,
-                            "_match_score": self._calculate_match_score(
-                                entry_name_lower,
-                                entry_title_lower,
-                            ),
-                        },
-                    )
+                    score = self._calculate_match_score(entry_name_lower, entry_title_lower)
+                    matches.append((score, entry, entry_title))
             else:
                 # Exact matching
                 if entry_title_lower == entry_name_lower:
-                    matching_entries.append(
-                        {**entry, "_title": entry_title, "_match_score": 1.0},
-                    )
+                    matches.append((1.0, entry, entry_title))
+
+        # Rank by match score (higher is better), selecting only the top
+        # results when limited instead of sorting every match
+        if limit is None:
+            ranked = sorted(matches, key=itemgetter(0), reverse=True)
+        else:
+            ranked = heapq.nlargest(limit, matches, key=itemgetter(0))
 
-        # Sort by match score (higher is better)
-        matching_entries.sort(key=lambda x: x["_match_score"], reverse=True)
-        return matching_entries
+        entries = [
+            {**entry, "_title": entry_title, "_match_score": score}
+            for score, entry, entry_title in ranked
+        ]
+        return entries, len(matches)
 
     def _extract_entry_title(self, entry_properties: dict[str, Any]) -> str:
         """Extract title from database entry properties."""
@@ -1,12 +1,34 @@
 """Configuration management for Notion CLI."""
 
+import contextlib
+import hashlib
+import json
 import os
+import stat
+import tempfile
+import time
 from pathlib import Path
+from types import ModuleType
+from typing import Any
 
 import toml
 from platformdirs import user_config_dir
 from pydantic import BaseModel
 
+orjson: ModuleType | None
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Environment variables that override each cache TTL setting
+_TTL_ENV_VARS = {
+    "cache_ttl": "NOTION_CLI_CACHE_TTL",
+    "search_cache_ttl": "NOTION_CLI_SEARCH_CACHE_TTL",
+    "llm_cache_ttl": "NOTION_CLI_LLM_CACHE_TTL",
+}
+
 
 class NotionConfig(BaseModel):
     """Configuration model for Notion CLI."""
@@ -17,6 +39,13 @@ class NotionConfig(BaseModel):
     llm_api_key: str | None = None
     default_database: str | None = None
     default_view: str | None = None
+    # Seconds to keep cached database lookups; 0 disables the cache
+    cache_ttl: int = 24 * 60 * 60
+    # Seconds to keep cached database and page listings; 0 disables the cache
+    search_cache_ttl: int = 60
+    # Seconds to keep cached LLM responses for identical prompts; 0 (the default)
+    # disables the cache, so a rejected answer is not replayed on the next run
+    llm_cache_ttl: int = 0
 
 
 class ConfigManager:
@@ -31,49 +60,93 @@ class ConfigManager:
             config_dir = Path(user_config_dir("notion", "notion"))
             self.config_path = config_dir / "config.toml"
 
+        # Loaded configuration, kept so each lookup does not re-read the file
+        self._config: NotionConfig | None = None
+        # Values the loaded configuration took from the file and the environment
+        self._file_data: dict[str, Any] = {}
+        self._env_data: dict[str, Any] = {}
+
+        self.cache_path = self.config_path.parent / "schema_cache.json"
+        self.search_cache_path = self.config_path.parent / "search_cache.json"
+        self.llm_cache_path = self.config_path.parent / "llm_cache.json"
+        # Parsed cache files with the mtime they were read at, so repeated
+        # lookups skip re-reading a file that has not changed on disk
+        self._cache_files: dict[Path, tuple[int, dict[str, Any]]] = {}
+
         # Ensure the config directory exists
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
 
     def load_config(self) -> NotionConfig:
         """Load configuration from file or environment."""
-        config_data = {}
+        if self._config is not None:
+            return self._config
+
+        file_data: dict[str, Any] = {}
 
         # Load from file if exists
         if self.config_path.exists():
-            config_data = toml.load(self.config_path)
+            file_data = toml.load(self.config_path)
 
         # Override with environment variables if set
+        env_data: dict[str, Any] = {}
         if env_token := os.getenv("NOTION_TOKEN"):
-            config_data["integration_token"] = env_token
+            env_data["integration_token"] = env_token
         if llm_model := os.getenv("NOTION_CLI_LLM_MODEL"):
-            config_data["llm_model"] = llm_model
+            env_data["llm_model"] = llm_model
+        for key, env_var in _TTL_ENV_VARS.items():
+            if ttl := os.getenv(env_var):
+                try:
+                    env_data[key] = int(ttl)
+                except ValueError:
+                    raise ValueError(
+                        f"{env_var} must be a whole number of seconds, got '{ttl}'"
+                    ) from None
         # Legacy support for API keys from environment
+        has_model = bool(env_data.get("llm_model") or file_data.get("llm_model"))
         if openai_key := os.getenv("OPENAI_API_KEY"):
-            config_data["llm_api_key"] = openai_key
-            if not config_data.get("llm_model"):
-                config_data["llm_model"] = "gpt-4.1-mini"
+            env_data["llm_api_key"] = openai_key
+            if not has_model:
+                env_data["llm_model"] = "gpt-4.1-mini"
         elif anthropic_key := os.getenv("ANTHROPIC_API_KEY"):
-            config_data["llm_api_key"] = anthropic_key
-            if not config_data.get("llm_model"):
-                config_data["llm_model"] = "claude-3-haiku-20240307"
+            env_data["llm_api_key"] = anthropic_key
+            if not has_model:
+                env_data["llm_model"] = "claude-3-haiku-20240307"
         elif google_key := os.getenv("GOOGLE_API_KEY"):
-            config_data["llm_api_key"] = google_key
-            if not config_data.get("llm_model"):
-                config_data["llm_model"] = "gemini-pro"
+            env_data["llm_api_key"] = google_key
+            if not has_model:
+                env_data["llm_model"] = "gemini-pro"
 
-        return NotionConfig(**config_data)
+        # Kept so saving writes back the file's own values, not one-off overrides
+        self._file_data = file_data
+        self._env_data = env_data
+        self._config = NotionConfig(**{**file_data, **env_data})
+        return self._config
 
     def save_config(self, config: NotionConfig) -> None:
         """Save configuration to file."""
-        config_dict = config.model_dump(exclude_none=True)
-        with open(self.config_path, "w") as f:
-            toml.dump(config_dict, f)
+        config_dict = config.model_dump(exclude_defaults=True)
+
+        # Values still equal to an environment override came from the
+        # environment, so keep whatever the file had for them instead
+        for key, env_value in self._env_data.items():
+            if getattr(config, key) != env_value:
+                continue
+            if key in self._file_data:
+                config_dict[key] = self._file_data[key]
+            else:
+                config_dict.pop(key, None)
+
+        write_file_atomically(self.config_path, toml.dumps(config_dict).encode())
+        # Reload on next access so environment overrides apply on top of the file
+        self._config = None
 
     def set_token(self, token: str) -> None:
         """Set the integration token."""
         config = self.load_config()
         config.integration_token = token
         self.save_config(config)
+        # Cached lookups belong to the previous workspace
+        self.clear_cache()
 
     def add_database(self, name: str, database_id: str) -> None:
         """Add a database mapping."""
@@ -114,3 +187,191 @@ class ConfigManager:
         """Get the default view."""
         config = self.load_config()
         return config.default_view
+
+    def get_cached_database(self, name: str) -> dict[str, Any] | None:
+        """Get a cached database object by name if it has not expired."""
+        config = self.load_config()
+        if config.cache_ttl <= 0 or not config.integration_token:
+            return None
+
+        workspace = self._read_cache(self.cache_path).get(
+            _workspace_key(config.integration_token),
+            {},
+        )
+        cached = workspace.get(name.lower())
+        if not cached or time.time() - cached.get("fetched_at", 0) > config.cache_ttl:
+            return None
+
+        database = cached.get("database")
+        return database if isinstance(database, dict) else None
+
+    def cache_database(self, name: str, database: dict[str, Any]) -> None:
+        """Cache a database object, including its properties, under the given name."""
+        config = self.load_config()
+        if config.cache_ttl <= 0 or not config.integration_token:
+            return
+
+        cache = self._read_cache(self.cache_path)
+        workspace = cache.setdefault(_workspace_key(config.integration_token), {})
+        workspace[name.lower()] = {"database": database, "fetched_at": time.time()}
+
+        self._write_cache(self.cache_path, cache)
+
+    def evict_cached_database(self, database_id: str) -> None:
+        """Remove every cached name lookup that resolved to the given database."""
+        config = self.load_config()
+        if not config.integration_token:
+            return
+
+        cache = self._read_cache(self.cache_path)
+        workspace = cache.get(_workspace_key(config.integration_token), {})
+        stale = [
+            name
+            for name, cached in workspace.items()
+            if cached.get("database", {}).get("id") == database_id
+        ]
+        if not stale:
+            return
+
+        for name in stale:
+            del workspace[name]
+        self._write_cache(self.cache_path, cache)
+
+    def get_cached_search(self, kind: str) -> list[dict[str, Any]] | None:
+        """Get cached search results (e.g. "databases" or "pages") if not expired."""
+        config = self.load_config()
+        if config.search_cache_ttl <= 0 or not config.integration_token:
+            return None
+
+        workspace = self._read_cache(self.search_cache_path).get(
+            _workspace_key(config.integration_token),
+            {},
+        )
+        cached = workspace.get(kind)
+        if not cached or time.time() - cached.get("fetched_at", 0) > config.search_cache_ttl:
+            return None
+
+        results = cached.get("results")
+        return results if isinstance(results, list) else None
+
+    def cache_search(self, kind: str, results: list[dict[str, Any]]) -> None:
+        """Cache search results of the given kind."""
+        config = self.load_config()
+        if config.search_cache_ttl <= 0 or not config.integration_token:
+            return
+
+        cache = self._read_cache(self.search_cache_path)
+        workspace = cache.setdefault(_workspace_key(config.integration_token), {})
+        workspace[kind] = {"results": results, "fetched_at": time.time()}
+
+        self._write_cache(self.search_cache_path, cache)
+
+    def get_cached_llm_response(self, key: str) -> str | None:
+        """Get a cached LLM response by request key if it has not expired."""
+        config = self.load_config()
+        if config.llm_cache_ttl <= 0:
+            return None
+
+        cached = self._read_cache(self.llm_cache_path).get(key)
+        if not cached or time.time() - cached.get("fetched_at", 0) > config.llm_cache_ttl:
+            return None
+
+        content = cached.get("content")
+        return content if isinstance(content, str) else None
+
+    def cache_llm_response(self, key: str, content: str) -> None:
+        """Cache an LLM response, dropping entries that have already expired."""
+        config = self.load_config()
+        if config.llm_cache_ttl <= 0:
+            return
+
+        now = time.time()
+        cache = {
+            cached_key: cached
+            for cached_key, cached in self._read_cache(self.llm_cache_path).items()
+            if now - cached.get("fetched_at", 0) <= config.llm_cache_ttl
+        }
+        cache[key] = {"content": content, "fetched_at": now}
+
+        self._write_cache(self.llm_cache_path, cache)
+
+    def clear_search_cache(self) -> None:
+        """Remove cached search results, e.g. after creating a page."""
+        self.search_cache_path.unlink(missing_ok=True)
+
+    def clear_cache(self) -> None:
+        """Remove all cached database lookups, search results and LLM responses."""
+        self.cache_path.unlink(missing_ok=True)
+        self.llm_cache_path.unlink(missing_ok=True)
+        self.clear_search_cache()
+
+    def _read_cache(self, path: Path) -> dict[str, Any]:
+        """Read a cache file, treating a missing or corrupt file as empty."""
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            self._cache_files.pop(path, None)
+            return {}
+
+        cached = self._cache_files.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        try:
+            if orjson is not None:
+                cache = orjson.loads(path.read_bytes())
+            else:
+                with open(path) as f:
+                    cache = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return {}
+        if not isinstance(cache, dict):
+            return {}
+
+        self._cache_files[path] = (mtime, cache)
+        return cache
+
+    def _write_cache(self, path: Path, cache: dict[str, Any]) -> None:
+        """Write a cache file atomically and remember its parsed contents.
+
+        Caching is best-effort, so a failed write (e.g. a read-only config
+        directory) only drops the in-memory copy instead of failing the command.
+        """
+        data = orjson.dumps(cache) if orjson is not None else json.dumps(cache).encode()
+        try:
+            mtime = write_file_atomically(path, data)
+        except OSError:
+            self._cache_files.pop(path, None)
+            return
+        self._cache_files[path] = (mtime, cache)
+
+
+def write_file_atomically(path: Path, data: bytes) -> int:
+    """Replace a file's contents via a unique temporary file, returning its mtime.
+
+    The temporary file starts with the target's permissions (owner-only for a
+    new file) so data is never readable more widely than the file it replaces.
+    """
+    try:
+        mode = stat.S_IMODE(path.stat().st_mode)
+    except OSError:
+        mode = 0o600
+
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        os.chmod(tmp_name, mode)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            mtime = os.fstat(f.fileno()).st_mtime_ns
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_name)
+        raise
+    return mtime
+
+
+def _workspace_key(token: str) -> str:
+    """Derive a cache key for the workspace without storing the token itself."""
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
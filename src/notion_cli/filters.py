@@ -1,5 +1,6 @@
 """Filter parsing and conversion for Notion CLI."""
 
+import functools
 from dataclasses import dataclass
 from typing import Any, Union
 
@@ -672,3 +673,31 @@ class NotionFilterConverter:
             # For atomic conditions, we need to map to opposite operations
             # This is complex and may not be fully supported by Notion API
             return condition  # Simplified - return original
+
+
+@functools.lru_cache(maxsize=128)
+def parse_filter(filter_text: str) -> FilterCondition | LogicalGroup | list[FilterCondition]:
+    """Parse a filter expression, reusing the result for repeated expressions."""
+    # A fresh parser per call keeps its cursor state private to this parse
+    return FilterParser().parse(filter_text)
+
+
+# Stateless, so one converter is shared by every compiled filter
+_CONVERTER = NotionFilterConverter()
+
+
+def compile_filter(filter_text: str, properties: dict[str, Any]) -> dict[str, Any]:
+    """Parse and convert a filter expression to Notion API format, caching the result."""
+    # The converter only needs each property's type, which makes a compact cache key
+    property_types = tuple((name, data.get("type", "")) for name, data in properties.items())
+    return _compile_filter(filter_text, property_types)
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_filter(
+    filter_text: str,
+    property_types: tuple[tuple[str, str], ...],
+) -> dict[str, Any]:
+    """Compile a filter against property types; the result must not be mutated."""
+    properties = {name: {"type": prop_type} for name, prop_type in property_types}
+    return _CONVERTER.convert(parse_filter(filter_text), properties)
@@ -1,7 +1,10 @@
 """LLM service for natural language processing and structured data generation."""
 
+import functools
+import hashlib
 import json
 import os
+from collections.abc import Callable
 from typing import Any
 
 import litellm
@@ -16,6 +19,140 @@ from .config import ConfigManager
 load_dotenv()
 
 
+# Property types whose schema carries a list of named options
+_OPTION_TYPES = frozenset({"select", "multi_select", "status"})
+
+
+def _option_names(prop_data: dict[str, Any], prop_type: str) -> list[str]:
+    """Extract option names from a select-like Notion property definition."""
+    options = prop_data.get(prop_type, {}).get("options", ())
+    return [opt["name"] for opt in options if "name" in opt]
+
+
+def _select_schema(options: list[str]) -> dict[str, Any]:
+    """Build the schema for a select property."""
+    return {"type": "string", "enum": options, "description": f"Select one of: {options}"}
+
+
+def _multi_select_schema(options: list[str]) -> dict[str, Any]:
+    """Build the schema for a multi-select property."""
+    return {
+        "type": "array",
+        "items": {"type": "string", "enum": options},
+        "description": f"Select multiple from: {options}",
+    }
+
+
+def _status_schema(options: list[str]) -> dict[str, Any]:
+    """Build the schema for a status property."""
+    return {"type": "string", "enum": options, "description": f"Status: {options}"}
+
+
+# JSON schema builders keyed by Notion property type, called with the
+# property's option names (empty for types without options)
+_SCHEMA_BUILDERS: dict[str, Callable[[list[str]], dict[str, Any]]] = {
+    "title": lambda _: {"type": "string", "description": "Title/name field"},
+    "rich_text": lambda _: {"type": "string", "description": "Rich text content"},
+    "number": lambda _: {"type": "number", "description": "Numeric value"},
+    "select": _select_schema,
+    "multi_select": _multi_select_schema,
+    "date": lambda _: {
+        "type": "string",
+        "format": "date",
+        "description": "Date in YYYY-MM-DD format",
+    },
+    "checkbox": lambda _: {"type": "boolean", "description": "True/false value"},
+    "url": lambda _: {"type": "string", "format": "uri", "description": "URL address"},
+    "email": lambda _: {"type": "string", "format": "email", "description": "Email address"},
+    "phone_number": lambda _: {"type": "string", "description": "Phone number"},
+    "status": _status_schema,
+    "files": lambda _: {
+        "type": "string",
+        "enum": ["__FILE__"],
+        "description": "File attachment - use '__FILE__' to indicate a file should be uploaded",
+    },
+}
+
+# Hashable summary of a database schema: (name, type, option names) per property
+_SchemaShape = tuple[tuple[str, str, tuple[str, ...]], ...]
+
+
+def _schema_shape(properties: dict[str, Any]) -> _SchemaShape:
+    """Reduce Notion properties to the parts that affect the generated JSON schema."""
+    shape = []
+    for prop_name, prop_data in properties.items():
+        prop_type = prop_data.get("type", "")
+        options = _option_names(prop_data, prop_type) if prop_type in _OPTION_TYPES else []
+        shape.append((prop_name, prop_type, tuple(options)))
+    return tuple(shape)
+
+
+@functools.lru_cache(maxsize=32)
+def _build_notion_schema(shape: _SchemaShape) -> tuple[dict[str, Any], str]:
+    """Build a JSON schema and its serialized form from a schema shape."""
+    schema = {"type": "object", "properties": {}}
+
+    for prop_name, prop_type, options in shape:
+        builder = _SCHEMA_BUILDERS.get(prop_type)
+
+        if builder:
+            schema["properties"][prop_name] = builder(list(options))
+        else:
+            # Default to string for unknown types
+            schema["properties"][prop_name] = {
+                "type": "string",
+                "description": f"Field of type {prop_type}",
+            }
+
+    return schema, json.dumps(schema, indent=2)
+
+
+# Filter syntax and targeting rules for the edit prompt
+_FILTER_GUIDE = (
+    "Filter syntax:\n"
+    "- Equality: property=value\n"
+    "- Not equal: property!=value\n"
+    "- Contains: property~value\n"
+    "- Does not contain: property!~value\n"
+    "- Greater than: property>value\n"
+    "- Less than: property<value\n"
+    "- Greater than or equal: property>=value\n"
+    "- Less than or equal: property<=value\n"
+    "- In list: property in 'value1,value2,value3'\n"
+    "- Not in list: property not in 'value1,value2,value3'\n"
+    "- Multiple conditions: condition1,condition2 (AND)\n"
+    "- OR conditions: OR(condition1,condition2)\n"
+    "- NOT conditions: NOT(condition)\n\n"
+    "Important rules:\n"
+    "- Focus on WHO/WHAT entries to target, not what changes to make\n"
+    "- For requests like 'Add X to Y' or 'Update X for Y', filter by Y's identifier\n"
+    "- Do NOT filter by properties that will be updated/added\n"
+    "- Use exact property names from the available properties list\n"
+    "- For properties with spaces in names, use the exact name\n"
+    "- Use CONTAINS (~) for partial names/text matching unless exact match is clearly intended\n"
+    "- Use EQUALS (=) only when the full exact value is provided\n\n"
+    "Examples:\n"
+    "- 'Add resume to John Doe' → Name~John Doe (contains, in case full name differs)\n"
+    "- 'Update status for urgent tasks' → Tags~urgent\n"
+    "- 'Set linkedin for aman' → Name~aman (partial name match)\n"
+    "- 'Set priority for Project Alpha' → Name~Project Alpha\n"
+    "- 'Update completed tasks' → Status=Completed (exact status value)\n\n"
+)
+
+
+def _describe_files(files: list[str]) -> str:
+    """List files to be uploaded, with their sizes, for inclusion in a prompt."""
+    file_info = []
+    for file_path in files:
+        if os.path.exists(file_path):
+            file_name = os.path.basename(file_path)
+            file_size = os.path.getsize(file_path)
+            file_info.append(f"- {file_name} ({file_size} bytes)")
+        else:
+            file_info.append(f"- {file_path} (file not found)")
+    return "\n".join(file_info)
+
+
 class LLMConfig(BaseModel):
     """Configuration for LLM service."""
 
@@ -68,6 +205,65 @@ class LLMService:
         elif "gemini" in model_lower or "google" in model_lower:
             os.environ["GOOGLE_API_KEY"] = api_key
 
+    def _system_message(self, system_prompt: str) -> dict[str, Any]:
+        """Build the system message, marking it cacheable for Anthropic models."""
+        model_lower = self.config.model.lower()
+        if "claude" not in model_lower and "anthropic" not in model_lower:
+            # OpenAI and Gemini cache repeated prompt prefixes automatically
+            return {"role": "system", "content": system_prompt}
+
+        # The schema-bearing system prompt repeats across runs on the same
+        # database, so let Anthropic reuse it instead of re-reading it each time
+        return {
+            "role": "system",
+            "content": [
+                {
+                    "type": "text",
+                    "text": system_prompt,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ],
+        }
+
+    def _complete(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool = False,
+        refresh: bool = False,
+    ) -> str:
+        """Run a chat completion, reusing a cached response for an identical request.
+
+        With refresh, a cached response is ignored and replaced by the new one.
+        """
+        # The system prompt embeds the database schema, so it is part of the key
+        request = json.dumps(
+            [self.config.model, system_prompt, user_prompt, temperature, max_tokens, json_mode]
+        )
+        key = hashlib.sha256(request.encode()).hexdigest()
+        if not refresh and (cached := self.config_manager.get_cached_llm_response(key)):
+            return cached
+
+        response = litellm.completion(
+            model=self.config.model,
+            messages=[
+                self._system_message(system_prompt),
+                {"role": "user", "content": user_prompt},
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **({"response_format": {"type": "json_object"}} if json_mode else {}),
+        )
+
+        content = response.choices[0].message.content
+        if json_mode:
+            # Raise before caching so a malformed response is not replayed on retry
+            json.loads(content)
+        self.config_manager.cache_llm_response(key, content)
+        return content
+
     def _prompt_for_llm_config(self) -> tuple[str, str]:
         """Prompt user for LLM model and API key."""
         console = Console()
@@ -144,6 +340,7 @@ class LLMService:
         context: str = "",
         allow_revision: bool = False,
         files: list[str] | None = None,
+        schema_json: str | None = None,
     ) -> dict[str, Any]:
         """Generate structured data based on a prompt and schema."""
         return self._generate_with_revision(
@@ -153,6 +350,7 @@ class LLMService:
             allow_revision,
             self._structured_data_generator,
             files=files,
+            schema_json=schema_json,
         )
 
     def _generate_with_revision(
@@ -171,11 +369,14 @@ class LLMService:
 
         console = Console()
         current_prompt = prompt
+        # Regenerations must not replay a cached response the user just rejected
+        refresh = False
 
         while True:
             try:
                 # Generate using the provided generator function
-                result = generator_func(current_prompt, schema, context, **kwargs)
+                result = generator_func(current_prompt, schema, context, refresh=refresh, **kwargs)
+                refresh = True
 
                 if not allow_revision:
                     return result
@@ -264,23 +465,16 @@ class LLMService:
         schema: dict[str, Any],
         context: str = "",
         files: list[str] | None = None,
+        schema_json: str | None = None,
+        refresh: bool = False,
     ) -> dict[str, Any]:
         """Internal method to generate structured data."""
+        if schema_json is None:
+            schema_json = json.dumps(schema, indent=2)
+
         file_context = ""
         if files:
-            import os
-
-            file_info = []
-            for file_path in files:
-                if os.path.exists(file_path):
-                    file_name = os.path.basename(file_path)
-                    file_size = os.path.getsize(file_path)
-                    file_info.append(f"- {file_name} ({file_size} bytes)")
-                else:
-                    file_info.append(f"- {file_path} (file not found)")
-
-            if file_info:
-                file_context = "\nFiles to be uploaded:\n" + "\n".join(file_info) + "\n"
+            file_context = f"\nFiles to be uploaded:\n{_describe_files(files)}\n"
 
         system_prompt = (
             "You are a helpful assistant that converts natural language "
@@ -290,7 +484,7 @@ class LLMService:
             "schema exactly.\n"
             "Do not include any additional text or explanations - "
             "only the JSON response.\n\n"
-            f"Schema:\n{json.dumps(schema, indent=2)}\n\n"
+            f"Schema:\n{schema_json}\n\n"
             "Guidelines:\n"
             "- Use appropriate data types for each field\n"
             "- For dates, use ISO format (YYYY-MM-DD)\n"
@@ -310,263 +504,75 @@ Prompt: {prompt}
 
 Respond with valid JSON only:"""
 
-        response = litellm.completion(
-            model=self.config.model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=self.config.temperature,
-            max_tokens=self.config.max_tokens,
-            response_format={"type": "json_object"},
+        content = self._complete(
+            system_prompt,
+            user_prompt,
+            self.config.temperature,
+            self.config.max_tokens,
+            json_mode=True,
+            refresh=refresh,
         )
 
-        content = response.choices[0].message.content
         return json.loads(content)
 
-    def generate_filters_from_prompt(
+    def generate_filter_and_updates(
         self,
         prompt: str,
         properties: dict[str, Any],
-    ) -> str:
-        """Generate filter expressions from natural language."""
-
-        # Create a simplified schema of properties for the LLM
-        prop_info = {}
-        for name, prop_data in properties.items():
-            prop_type = prop_data.get("type", "")
-            prop_info[name] = {"type": prop_type}
-
-            # Add options for select fields
-            if prop_type == "select" and "select" in prop_data:
-                options = prop_data["select"].get("options", [])
-                prop_info[name]["options"] = [opt.get("name", "") for opt in options]
-            elif prop_type == "multi_select" and "multi_select" in prop_data:
-                options = prop_data["multi_select"].get("options", [])
-                prop_info[name]["options"] = [opt.get("name", "") for opt in options]
-
-        system_prompt = (
-            "You are a database query assistant. Your job is to identify which "
-            "database entries should be updated, NOT to filter by what will be changed.\n\n"
-            f"Available properties:\n{json.dumps(prop_info, indent=2)}\n\n"
-            "Filter syntax:\n"
-            "- Equality: property=value\n"
-            "- Not equal: property!=value\n"
-            "- Contains: property~value\n"
-            "- Does not contain: property!~value\n"
-            "- Greater than: property>value\n"
-            "- Less than: property<value\n"
-            "- Greater than or equal: property>=value\n"
-            "- Less than or equal: property<=value\n"
-            "- In list: property in 'value1,value2,value3'\n"
-            "- Not in list: property not in 'value1,value2,value3'\n"
-            "- Multiple conditions: condition1,condition2 (AND)\n"
-            "- OR conditions: OR(condition1,condition2)\n"
-            "- NOT conditions: NOT(condition)\n\n"
-            "Important rules:\n"
-            "- Focus on WHO/WHAT entries to target, not what changes to make\n"
-            "- For requests like 'Add X to Y' or 'Update X for Y', filter by Y's identifier\n"
-            "- Do NOT filter by properties that will be updated/added\n"
-            "- Use exact property names from the available properties list\n"
-            "- For properties with spaces in names, use the exact name\n"
-            "- Use CONTAINS (~) for partial names/text matching unless exact match is clearly intended\n"
-            "- Use EQUALS (=) only when the full exact value is provided\n\n"
-            "Examples:\n"
-            "- 'Add resume to John Doe' → Name~John Doe (contains, in case full name differs)\n"
-            "- 'Update status for urgent tasks' → Tags~urgent\n"
-            "- 'Set linkedin for aman' → Name~aman (partial name match)\n"
-            "- 'Set priority for Project Alpha' → Name~Project Alpha\n"
-            "- 'Update completed tasks' → Status=Completed (exact status value)\n\n"
-            "CRITICAL: Respond with ONLY the filter expression. No explanations, "
-            "no parentheses with examples, no additional text."
-        )
-
-        user_prompt = f"""Convert this request into a filter expression:
-
-{prompt}
-
-Filter expression:"""
-
-        try:
-            response = litellm.completion(
-                model=self.config.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                temperature=0.1,
-                max_tokens=500,
-            )
-
-            return response.choices[0].message.content.strip()
-
-        except Exception as e:
-            raise ValueError(f"Failed to generate filters: {e}")
-
-    def generate_updates_from_prompt(
-        self,
-        prompt: str,
-        properties: dict[str, Any],
-        current_data: dict[str, Any] | None = None,
         files: list[str] | None = None,
-    ) -> dict[str, Any]:
-        """Generate update data from natural language prompt."""
-
-        # Create schema for updates
-        schema = self._create_notion_schema(properties)
-
-        context = f"Available properties: {list(properties.keys())}"
-        if current_data:
-            context += f"\nCurrent data: {json.dumps(current_data, indent=2)}"
+        schema_json: str | None = None,
+    ) -> tuple[str, dict[str, Any]]:
+        """Generate both the target filter and the update data in a single request."""
+        if schema_json is None:
+            _, schema_json = self._create_notion_schema(properties)
 
         file_context = ""
         if files:
-            import os
-
-            file_info = []
-            for file_path in files:
-                if os.path.exists(file_path):
-                    file_name = os.path.basename(file_path)
-                    file_size = os.path.getsize(file_path)
-                    file_info.append(f"- {file_name} ({file_size} bytes)")
-                else:
-                    file_info.append(f"- {file_path} (file not found)")
-
-            if file_info:
-                file_context = "\nFiles to be uploaded:\n" + "\n".join(file_info)
+            file_context = f"Files to be uploaded:\n{_describe_files(files)}\n\n"
 
         system_prompt = (
-            "You are updating database entries. Convert the update request "
-            "into structured data.\n\n"
-            f"{context}{file_context}\n\n"
-            "Only include fields that should be updated. Leave out fields that are not "
-            "mentioned or should remain unchanged.\n\n"
-            f"Schema for updates:\n{json.dumps(schema, indent=2)}\n\n"
-            "Guidelines:\n"
+            "You are a database editing assistant. Split the edit request into a filter "
+            "that identifies which entries to update and the data to update them with.\n\n"
+            f"Schema of the database properties:\n{schema_json}\n\n"
+            f"{file_context}"
+            "Respond with a JSON object with exactly two keys:\n"
+            '- "filter": a filter expression string selecting the entries to update\n'
+            '- "updates": an object containing only the fields to change\n\n'
+            f"{_FILTER_GUIDE}"
+            "Update guidelines:\n"
+            "- Only include fields that need to be changed; leave out unchanged fields\n"
             "- For file fields, use the special value '__FILE__' to indicate "
-            "a file should be uploaded\n"
-            "- Only include fields that need to be changed\n\n"
-            "Respond with valid JSON containing only the fields to update:"
+            "a file should be uploaded\n\n"
+            "Respond with valid JSON only, no explanations."
         )
 
-        user_prompt = f"""Update request: {prompt}
+        user_prompt = f"""Edit request: {prompt}
 
-JSON for updates:"""
+JSON with filter and updates:"""
 
         try:
-            response = litellm.completion(
-                model=self.config.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                temperature=0.1,
-                max_tokens=1000,
-                response_format={"type": "json_object"},
-            )
-
-            content = response.choices[0].message.content
-            return json.loads(content)
+            content = self._complete(system_prompt, user_prompt, 0.1, 1000, json_mode=True)
 
+            result = json.loads(content)
         except json.JSONDecodeError as e:
             raise ValueError(f"Failed to parse LLM response as JSON: {e}")
         except Exception as e:
             raise ValueError(f"LLM request failed: {e}")
 
-    def _create_notion_schema(self, properties: dict[str, Any]) -> dict[str, Any]:
-        """Create a JSON schema from Notion properties."""
-        schema = {"type": "object", "properties": {}}
-
-        for prop_name, prop_data in properties.items():
-            prop_type = prop_data.get("type", "")
+        if not isinstance(result, dict):
+            raise ValueError("Failed to parse LLM response: expected a JSON object")
+        updates = result.get("updates") or {}
+        if not isinstance(updates, dict):
+            raise ValueError("Failed to parse LLM response: 'updates' must be a JSON object")
 
-            if prop_type == "title":
-                schema["properties"][prop_name] = {
-                    "type": "string",
-                    "description": "Title/name field",
-                }
-            elif prop_type == "rich_text":
-                schema["properties"][prop_name] = {
-                    "type": "string",
-                    "description": "Rich text content",
-                }
-            elif prop_type == "number":
-                schema["properties"][prop_name] = {
-                    "type": "number",
-                    "description": "Numeric value",
-                }
-            elif prop_type == "select":
-                options = []
-                if "select" in prop_data and "options" in prop_data["select"]:
-                    options = [opt.get("name", "") for opt in prop_data["select"]["options"]]
-                schema["properties"][prop_name] = {
-                    "type": "string",
-                    "enum": options,
-                    "description": f"Select one of: {options}",
-                }
-            elif prop_type == "multi_select":
-                options = []
-                if "multi_select" in prop_data and "options" in prop_data["multi_select"]:
-                    options = [opt.get("name", "") for opt in prop_data["multi_select"]["options"]]
-                schema["properties"][prop_name] = {
-                    "type": "array",
-                    "items": {"type": "string", "enum": options},
-                    "description": f"Select multiple from: {options}",
-                }
-            elif prop_type == "date":
-                schema["properties"][prop_name] = {
-                    "type": "string",
-                    "format": "date",
-                    "description": "Date in YYYY-MM-DD format",
-                }
-            elif prop_type == "checkbox":
-                schema["properties"][prop_name] = {
-                    "type": "boolean",
-                    "description": "True/false value",
-                }
-            elif prop_type == "url":
-                schema["properties"][prop_name] = {
-                    "type": "string",
-                    "format": "uri",
-                    "description": "URL address",
-                }
-            elif prop_type == "email":
-                schema["properties"][prop_name] = {
-                    "type": "string",
-                    "format": "email",
-                    "description": "Email address",
-                }
-            elif prop_type == "phone_number":
-                schema["properties"][prop_name] = {
-                    "type": "string",
-                    "description": "Phone number",
-                }
-            elif prop_type == "status":
-                options = []
-                if "status" in prop_data and "options" in prop_data["status"]:
-                    options = [opt.get("name", "") for opt in prop_data["status"]["options"]]
-                schema["properties"][prop_name] = {
-                    "type": "string",
-                    "enum": options,
-                    "description": f"Status: {options}",
-                }
-            elif prop_type == "files":
-                schema["properties"][prop_name] = {
-                    "type": "string",
-                    "enum": ["__FILE__"],
-                    "description": "File attachment - use '__FILE__' to indicate a file should be uploaded",
-                }
-            else:
-                # Default to string for unknown types
-                schema["properties"][prop_name] = {
-                    "type": "string",
-                    "description": f"Field of type {prop_type}",
-                }
+        return str(result.get("filter") or "").strip(), updates
 
-        return schema
+    def _create_notion_schema(self, properties: dict[str, Any]) -> tuple[dict[str, Any], str]:
+        """Create a JSON schema from Notion properties, along with its serialized form."""
+        # Memoized on the schema shape, so the returned schema must not be mutated
+        return _build_notion_schema(_schema_shape(properties))
 
 
-def get_default_llm_service() -> LLMService:
-    """Get a default LLM service instance."""
-    config_manager = ConfigManager()
+def get_default_llm_service(config_manager: ConfigManager | None = None) -> LLMService:
+    """Get a default LLM service instance, sharing the given config manager if any."""
     return LLMService(config_manager=config_manager)
@@ -1,47 +1,182 @@
 """Main CLI application entry point."""
 
+import itertools
+import re
 import shutil
+import signal
+import threading
 import traceback
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import questionary
 import typer
-from md2notionpage.core import parse_md
 from rich.console import Console
+from rich.style import Style
 from rich.table import Table
+from rich.text import Text
 
-from .client import NotionClientWrapper
-from .config import ConfigManager
-from .filters import FilterParser, NotionFilterConverter
-from .llm import get_default_llm_service
+from .filters import compile_filter
 from .notion_data import NotionDataConverter
-from .views import DatabaseView, ViewsManager
+
+if TYPE_CHECKING:
+    from .client import NotionClientWrapper
+    from .config import ConfigManager
+    from .views import DatabaseView, ViewsManager
 
 app = typer.Typer(
     help="A CLI tool for Notion database operations using natural language",
+    no_args_is_help=True,
 )
-auth_app = typer.Typer(help="Authentication commands")
-db_app = typer.Typer(help="Database commands")
-view_app = typer.Typer(help="View management commands")
-page_app = typer.Typer(help="Page management commands")
-completion_app = typer.Typer(help="Shell completion commands")
+auth_app = typer.Typer(help="Authentication commands", no_args_is_help=True)
+db_app = typer.Typer(help="Database commands", no_args_is_help=True)
+view_app = typer.Typer(help="View management commands", no_args_is_help=True)
+page_app = typer.Typer(help="Page management commands", no_args_is_help=True)
+completion_app = typer.Typer(help="Shell completion commands", no_args_is_help=True)
+cache_app = typer.Typer(help="Cache management commands", no_args_is_help=True)
 
 app.add_typer(auth_app, name="auth")
 app.add_typer(db_app, name="db")
 app.add_typer(view_app, name="view")
 app.add_typer(page_app, name="page")
 app.add_typer(completion_app, name="completion")
+app.add_typer(cache_app, name="cache")
 
 console = Console()
 
+# Rich link markup produced for clickable cells, e.g. "[link=url]text[/link]"
+_LINK_RE = re.compile(r"\[link=([^\]]+)\](.*?)\[/link\]", re.S)
+_TITLE_COLUMN_NAMES = frozenset({"name", "title", "task", "item"})
+
+
+def _truncate(value: str, max_len: int) -> str:
+    """Cut a cell value to max_len characters, marking the cut with an ellipsis."""
+    if len(value) > max_len:
+        return value[: max_len - 3] + "..."
+    return value
+
+
+def _format_cell(value: str, link_url: str, max_len: int, link_len: int) -> Text:
+    """Build a table cell as Text so Rich does not parse entry data as markup."""
+    if not value:
+        return Text("—")
+    if link_url:
+        # Make the title/name clickable with the entry URL
+        return Text(_truncate(value, link_len), style=Style(link=link_url))
+    link_match = _LINK_RE.match(value)
+    if link_match:
+        # For links, keep the target but truncate the display text
+        url, display_text = link_match.groups()
+        return Text(_truncate(display_text, link_len), style=Style(link=url))
+    return Text(_truncate(value, max_len))
+
+
+def _copy_to_clipboard(text: str) -> None:
+    """Copy a link to the clipboard, warning instead of failing when that is not possible."""
+    try:
+        import pyperclip
+
+        pyperclip.copy(text)
+        console.print("✅ Link copied to clipboard!", style="green")
+    except ImportError:
+        console.print(
+            "⚠️ pyperclip not installed. Install with: pip install pyperclip",
+            style="yellow",
+        )
+    except Exception as e:
+        console.print(f"⚠️ Failed to copy to clipboard: {e}", style="yellow")
+
+
+def _format_summary_value(value: Any) -> str:
+    """Format a generated property value for the confirmation tables."""
+    if isinstance(value, list):
+        return ", ".join(map(str, value))
+    return str(value)
+
+
+def _compile_generated_filter(
+    filter_expression: str, properties: dict[str, Any]
+) -> dict[str, Any] | None:
+    """Compile an LLM-generated filter, warning and matching everything if it is invalid."""
+    if not filter_expression or filter_expression.lower() == "none":
+        return None
+    try:
+        return compile_filter(filter_expression, properties)
+    except Exception as e:
+        console.print(f"⚠️ Filter parsing failed: {e}", style="yellow")
+        return None
+
+
+# Cached terminal width, reset when the terminal is resized
+_terminal_width: int | None = None
+
+
+def _reset_terminal_width(*_: Any) -> None:
+    """Forget the cached terminal width."""
+    global _terminal_width
+    _terminal_width = None
+
+
+def get_terminal_width() -> int:
+    """Get the terminal width, querying the terminal only when it may have changed."""
+    global _terminal_width
+    if _terminal_width is None:
+        _terminal_width = shutil.get_terminal_size().columns
+        # SIGWINCH is not available on Windows, where the width is measured once
+        if hasattr(signal, "SIGWINCH"):
+            signal.signal(signal.SIGWINCH, _reset_terminal_width)
+    return _terminal_width
+
+
+# Notion client shared by every command in this process, created on first use
+_client: "NotionClientWrapper | None" = None
+
+
+def get_client() -> "NotionClientWrapper":
+    """Get the shared Notion client, creating it on first use."""
+    global _client
+    if _client is None:
+        # Imported here so commands that never reach Notion skip loading httpx
+        from .client import NotionClientWrapper
+
+        _client = NotionClientWrapper(get_config_manager())
+    return _client
+
+
+# Config manager shared by every command in this process, created on first use
+_config_manager: "ConfigManager | None" = None
+
+
+def get_config_manager() -> "ConfigManager":
+    """Get the shared config manager, creating it on first use."""
+    global _config_manager
+    if _config_manager is None:
+        from .config import ConfigManager
+
+        _config_manager = ConfigManager()
+    return _config_manager
+
+
+# Saved views manager shared by every command in this process, created on first use
+_views_manager: "ViewsManager | None" = None
+
+
+def get_views_manager() -> "ViewsManager":
+    """Get the shared views manager, creating it on first use."""
+    global _views_manager
+    if _views_manager is None:
+        from .views import ViewsManager
+
+        _views_manager = ViewsManager()
+    return _views_manager
+
 
 def get_database_name_or_default(database_name: str | None) -> str:
     """Get database name or fall back to default."""
     if database_name:
         return database_name
 
-    config_manager = ConfigManager()
+    config_manager = get_config_manager()
     default_db = config_manager.get_default_database()
     if default_db:
         return default_db
@@ -53,7 +188,7 @@ def get_database_name_or_default(database_name: str | None) -> str:
 
 def resolve_database_name(name: str, interactive: bool = True) -> dict[str, Any] | None:
     """Resolve a database name (exact or prefix) to a database object."""
-    client = NotionClientWrapper()
+    client = get_client()
     return client.get_database_by_name_or_prefix(name, interactive=interactive)
 
 
@@ -62,7 +197,7 @@ def get_view_name_or_default(view_name: str | None) -> str:
     if view_name:
         return view_name
 
-    config_manager = ConfigManager()
+    config_manager = get_config_manager()
     default_view = config_manager.get_default_view()
     if default_view:
         return default_view
@@ -72,9 +207,9 @@ def get_view_name_or_default(view_name: str | None) -> str:
     raise typer.Exit(1)
 
 
-def resolve_view_name(name: str, interactive: bool = True) -> DatabaseView | None:
+def resolve_view_name(name: str, interactive: bool = True) -> "DatabaseView | None":
     """Resolve a view name (exact or prefix) to a view object."""
-    views_manager = ViewsManager()
+    views_manager = get_views_manager()
     return views_manager.load_view_by_name_or_prefix(name, interactive=interactive)
 
 
@@ -84,10 +219,12 @@ def setup_auth(
 ) -> None:
     """Set up authentication with Notion integration token."""
     try:
-        config_manager = ConfigManager()
+        config_manager = get_config_manager()
         config_manager.set_token(token)
 
         # Test the connection
+        from .client import NotionClientWrapper
+
         client = NotionClientWrapper(config_manager)
         if client.test_connection():
             console.print("✅ Authentication successful!", style="green")
@@ -107,7 +244,7 @@ def setup_auth(
 def test_auth() -> None:
     """Test the current authentication."""
     try:
-        client = NotionClientWrapper()
+        client = get_client()
         if client.test_connection():
             console.print("✅ Authentication is working!", style="green")
         else:
@@ -126,7 +263,7 @@ def test_auth() -> None:
 def list_databases() -> None:
     """List all accessible databases."""
     try:
-        client = NotionClientWrapper()
+        client = get_client()
         databases = client.list_databases()
 
         if not databases:
@@ -139,19 +276,7 @@ def list_databases() -> None:
         table.add_column("URL", style="blue")
 
         for db in databases:
-            # Extract database title
-            title = "Untitled"
-            if "title" in db and db["title"]:
-                if isinstance(db["title"], list) and db["title"]:
-                    title = db["title"][0].get("plain_text", "Untitled")
-                elif isinstance(db["title"], str):
-                    title = db["title"]
-
-            # Get database ID and URL
-            db_id = db.get("id", "")
-            db_url = db.get("url", "")
-
-            table.add_row(title, db_id, db_url)
+            table.add_row(client.get_database_title(db), db.get("id", ""), db.get("url", ""))
 
         console.print(table)
 
@@ -177,14 +302,9 @@ def set_default_database(
             raise typer.Exit(1)
 
         # Extract the actual database title for setting default
-        resolved_database_name = ""
-        if "title" in database and database["title"]:
-            if isinstance(database["title"], list) and database["title"]:
-                resolved_database_name = database["title"][0].get("plain_text", "")
-            elif isinstance(database["title"], str):
-                resolved_database_name = database["title"]
-
-        config_manager = ConfigManager()
+        resolved_database_name = get_client().get_database_title(database, default="")
+
+        config_manager = get_config_manager()
         config_manager.set_default_database(resolved_database_name)
         console.print(f"✅ Default database set to: {resolved_database_name}", style="green")
     except Exception as e:
@@ -196,7 +316,7 @@ def set_default_database(
 def get_default_database() -> None:
     """Show the current default database."""
     try:
-        config_manager = ConfigManager()
+        config_manager = get_config_manager()
         default_db = config_manager.get_default_database()
         if default_db:
             console.print(f"Default database: {default_db}", style="green")
@@ -240,85 +360,91 @@ def show_database(
     """Show entries in a specific database by name."""
     # Get database name or use default
     name = get_database_name_or_default(name)
-
+    # Parse user-specified columns
+    user_columns = [col.strip() for col in columns.split(",")] if columns else None
+    _show_database(name, limit, user_columns, filter_expr, save_view)
+
+
+def _show_database(
+    name: str,
+    limit: int | None,
+    user_columns: list[str] | None,
+    filter_expr: str | None,
+    save_view: str | None,
+    database: dict[str, Any] | None = None,
+) -> None:
+    """Render database entries, resolving the database by name unless one is given."""
     try:
-        database = resolve_database_name(name)
-        client = NotionClientWrapper()
+        client = get_client()
+        # Imported here since the client module is only loaded once a command needs it
+        from .client import StaleDatabaseError
+
+        # Resolve the database and fetch the first page of entries, retrying
+        # once with a fresh lookup if the cached database turns out to be stale
+        retried = False
+        while True:
+            if database is None:
+                database = resolve_database_name(name)
+
+            if not database:
+                console.print(f"❌ Database '{name}' not found.", style="red")
+                console.print(
+                    "Use 'notion db list' to see available databases.",
+                    style="yellow",
+                )
+                raise typer.Exit(1)
 
-        if not database:
-            console.print(f"❌ Database '{name}' not found.", style="red")
-            console.print(
-                "Use 'notion db list' to see available databases.",
-                style="yellow",
-            )
-            raise typer.Exit(1)
+            # Get database properties
+            properties = database.get("properties", {})
+            if not properties:
+                console.print("No properties found in database schema.", style="yellow")
+                return
 
-        # Get database info
-        db_title = "Untitled"
-        if "title" in database and database["title"]:
-            if isinstance(database["title"], list) and database["title"]:
-                db_title = database["title"][0].get("plain_text", "Untitled")
+            # Parse filter if provided
+            filter_conditions = None
+            if filter_expr:
+                try:
+                    filter_conditions = compile_filter(filter_expr, properties)
+                except Exception as e:
+                    console.print(f"❌ Filter error: {e}", style="red")
+                    raise typer.Exit(1)
 
-        database_id = database.get("id", "")
+            # Push the limit down to the query and rely on Notion's has_more
+            # flag to tell whether more are available. Pages are streamed so
+            # rows are added as each API page arrives.
+            pages = client.iter_database_pages(database.get("id", ""), limit, filter_conditions)
+            try:
+                first_page = next(pages, None)
+                break
+            except StaleDatabaseError as e:
+                if retried:
+                    raise
+                # The cached database has been evicted, so resolving it again fetches it afresh
+                console.print(f"⚠️  {e}. Retrying with a fresh lookup...", style="yellow")
+                retried = True
+                database = None
 
-        # Get database properties
-        properties = database.get("properties", {})
-        if not properties:
-            console.print("No properties found in database schema.", style="yellow")
-            return
+        # Get database info
+        db_title = client.get_database_title(database)
+        database_url = database.get("url", "")
 
-        # Parse filter if provided
-        filter_conditions = None
         if filter_expr:
-            try:
-                parser = FilterParser()
-                converter = NotionFilterConverter()
-                parsed_filters = parser.parse(filter_expr)
-                filter_conditions = converter.convert(parsed_filters, properties)
-                msg = f"\n📋 Database: {db_title} (filtered)"
-                console.print(msg, style="bold cyan")
-
-                # Display database URL for filtered view too
-                database_url = database.get("url", "")
-                if database_url:
-                    console.print(
-                        f"🔗 Database URL: [link={database_url}]{database_url}[/link]", style="blue"
-                    )
-            except Exception as e:
-                console.print(f"❌ Filter error: {e}", style="red")
-                raise typer.Exit(1)
+            console.print(f"\n📋 Database: {db_title} (filtered)", style="bold cyan")
         else:
             console.print(f"\n📋 Database: {db_title}", style="bold cyan")
 
         # Display database URL
-        database_url = database.get("url", "")
         if database_url:
             console.print(
                 f"🔗 Database URL: [link={database_url}]{database_url}[/link]", style="blue"
             )
 
-        # Get all entries with filtering applied (no limit yet)
-        all_entries = client.get_database_entries(database_id, None, filter_conditions)
-
-        # Apply limit after filtering
-        if limit is not None:
-            entries = all_entries[:limit]
-            console.print(f"Showing {len(entries)} of {len(all_entries)} entries:\n")
-        else:
-            entries = all_entries
-            console.print(f"Showing all {len(entries)} entries:\n")
-
-        if not entries:
+        if first_page is None or not first_page.entries:
             console.print("No entries found in this database.", style="yellow")
             return
 
-        # Parse user-specified columns
-        user_columns = None
-        if columns:
-            user_columns = [col.strip() for col in columns.split(",")]
-
         # Get terminal width for dynamic sizing
-        terminal_width = shutil.get_terminal_size().columns
+        terminal_width = get_terminal_width()
 
         # Calculate optimal columns and widths
         displayed_props, column_widths = client.calculate_optimal_columns(
@@ -334,70 +460,60 @@ def show_database(
         # Create table with dynamic columns
         entries_table = Table(title=f"Entries from '{db_title}'")
 
-        # Add columns with calculated widths
-        for i, prop_name in enumerate(displayed_props):
-            width = column_widths[i] if i < len(column_widths) else 20
+        # Add columns with calculated widths and precompute per-column
+        # truncation limits so the row loop only does per-cell work; widths
+        # are padded so every displayed column has one
+        column_widths = column_widths + [20] * (len(displayed_props) - len(column_widths))
+        column_configs = []
+        for prop_name, width in zip(displayed_props, column_widths, strict=True):
             entries_table.add_column(prop_name, style="white", max_width=width)
+            max_len = width - 3
+            prop_type = properties.get(prop_name, {}).get("type", "")
+            is_title_column = prop_type == "title" or prop_name.lower() in _TITLE_COLUMN_NAMES
+            # Truncation plan: plain text is cut to max_len, while link text
+            # reserves extra room for its markup
+            column_configs.append(
+                (prop_name, prop_type, is_title_column, max_len, max_len - 10),
+            )
 
-        # Add rows
-        for entry in entries:
-            entry_properties = entry.get("properties", {})
-            entry_url = entry.get("url", "")
-            row_values = []
-
-            for i, prop_name in enumerate(displayed_props):
-                prop_data = entry_properties.get(prop_name, {})
-                value = client.extract_property_value(prop_data)
-
-                # Check if this is a title or name column - make it clickable
-                prop_type = prop_data.get("type", "")
-                is_title_column = prop_type == "title" or prop_name.lower() in [
-                    "name",
-                    "title",
-                    "task",
-                    "item",
+        # Add rows as pages stream in, showing progress on a transient status
+        # line; the table itself is rendered once, since re-rendering it as it
+        # grows costs more than the single final print
+        shown_count = 0
+        has_more = False
+        with console.status("📊 Fetching entries...") as status:
+            for page in itertools.chain([first_page], pages):
+                has_more = page.has_more
+                entry_urls = [entry.get("url", "") for entry in page.entries]
+                entry_properties = [entry.get("properties") or {} for entry in page.entries]
+                # Extract and format a page column by column, so each property
+                # type is dispatched once per page rather than once per cell
+                columns = [
+                    [
+                        _format_cell(value, url if is_title_column else "", max_len, link_len)
+                        for value, url in zip(
+                            client.extract_column_values(entry_properties, prop_name, prop_type),
+                            entry_urls,
+                            strict=True,
+                        )
+                    ]
+                    for prop_name, prop_type, is_title_column, max_len, link_len in column_configs
                 ]
-
-                if is_title_column and entry_url and value:
-                    # Make the title/name clickable with the entry URL
-                    value = f"[link={entry_url}]{value}[/link]"
-
-                # Truncate based on column width, handling rich markup
-                max_len = column_widths[i] - 3 if i < len(column_widths) else 20
-
-                # Check if this is a rich markup link
-                if "[link=" in value and "]" in value and "[/link]" in value:
-                    # For links, preserve the markup but truncate the display text
-                    try:
-                        link_start = value.find("[link=")
-                        link_end = value.find("]", link_start) + 1
-                        display_start = link_end
-                        display_end = value.find("[/link]")
-
-                        if display_end > display_start:
-                            url_part = value[link_start:link_end]
-                            display_text = value[display_start:display_end]
-
-                            # Reserve space for markup
-                            if len(display_text) > max_len - 10:
-                                display_text = display_text[: max_len - 13] + "..."
-
-                            value = f"{url_part}{display_text}[/link]"
-                    except (ValueError, IndexError):
-                        # Fallback to simple truncation if parsing fails
-                        if len(value) > max_len:
-                            value = value[: max_len - 3] + "..."
-                else:
-                    # Simple truncation for non-link text
-                    if len(value) > max_len:
-                        value = value[: max_len - 3] + "..."
-
-                row_values.append(value or "—")
-
-            entries_table.add_row(*row_values)
-
+                for row_values in zip(*columns, strict=True):
+                    entries_table.add_row(*row_values)
+                shown_count += len(page.entries)
+                status.update(f"📊 Fetched {shown_count} entries...")
+
+        # The count goes above the table, now that streaming has finished
+        if has_more:
+            console.print(f"Showing first {shown_count} entries:\n")
+        else:
+            console.print(f"Showing all {shown_count} entries:\n")
         console.print(entries_table)
 
+        # Collect the trailing hint lines so they are written at once
+        summary = Text()
+
         # Show helpful information
         total_properties = len(properties)
         displayed_count = len(displayed_props)
@@ -406,38 +522,33 @@ def show_database(
             invalid_columns = [col for col in user_columns if col not in properties]
             if invalid_columns:
                 invalid_str = ", ".join(invalid_columns)
-                console.print(
-                    f"\n⚠️  Invalid columns ignored: {invalid_str}",
-                    style="yellow",
-                )
+                summary.append(f"\n⚠️  Invalid columns ignored: {invalid_str}\n", style="yellow")
 
         if displayed_count < total_properties:
-            msg = f"\n💡 Showing {displayed_count} of {total_properties} properties"
-            console.print(msg, style="dim")
+            msg = f"\n💡 Showing {displayed_count} of {total_properties} properties\n"
+            summary.append(msg, style="dim")
 
             # Show available columns hint
-            all_columns = list(properties.keys())
-            available = [col for col in all_columns if col not in displayed_props][:5]
+            displayed_set = frozenset(displayed_props)
+            hidden_columns = (col for col in properties if col not in displayed_set)
+            available = list(itertools.islice(hidden_columns, 5))
             if available:
                 available_str = ", ".join(available)
                 suffix = "..." if len(available) == 5 else ""
-                console.print(
-                    f"💡 Available columns: {available_str}{suffix}",
-                    style="dim",
-                )
+                summary.append(f"💡 Available columns: {available_str}{suffix}\n", style="dim")
 
-        if limit is not None and len(all_entries) > limit:
-            remaining = len(all_entries) - limit
+        if has_more:
             msg = (
-                f"💡 {remaining} more entries available. Use --limit to see more "
-                "or remove --limit to see all."
+                "💡 More entries available. Use --limit to see more or remove --limit to see all.\n"
             )
-            console.print(msg, style="dim")
+            summary.append(msg, style="dim")
 
         # Save view if requested
         if save_view:
             try:
-                views_manager = ViewsManager()
+                from .views import DatabaseView
+
+                views_manager = get_views_manager()
                 view = DatabaseView(
                     name=save_view,
                     database_name=name,
@@ -447,14 +558,17 @@ def show_database(
                     description=f"Saved view for {name} database",
                 )
                 views_manager.save_view(view)
-                msg = f"✅ View '{save_view}' saved successfully!"
-                console.print(msg, style="green")
+                summary.append(f"✅ View '{save_view}' saved successfully!\n", style="green")
             except Exception as e:
-                console.print(f"❌ Failed to save view: {e}", style="red")
+                summary.append(f"❌ Failed to save view: {e}\n", style="red")
 
         # Show usage hint for custom columns
         if not user_columns and displayed_count < total_properties:
-            console.print("💡 Use --columns to specify custom columns", style="dim")
+            summary.append("💡 Use --columns to specify custom columns\n", style="dim")
+
+        summary.rstrip()
+        if summary:
+            console.print(summary)
 
     except ValueError as e:
         console.print(f"❌ {e}", style="red")
@@ -471,7 +585,7 @@ def show_database(
 def list_views() -> None:
     """List all saved views."""
     try:
-        views_manager = ViewsManager()
+        views_manager = get_views_manager()
         views = views_manager.list_views()
 
         if not views:
@@ -521,7 +635,7 @@ def set_default_view(
         # Use the resolved view name for setting default
         resolved_view_name = view.name
 
-        config_manager = ConfigManager()
+        config_manager = get_config_manager()
         config_manager.set_default_view(resolved_view_name)
         console.print(f"✅ Default view set to: {resolved_view_name}", style="green")
     except Exception as e:
@@ -533,7 +647,7 @@ def set_default_view(
 def get_default_view() -> None:
     """Show the current default view."""
     try:
-        config_manager = ConfigManager()
+        config_manager = get_config_manager()
         default_view = config_manager.get_default_view()
         if default_view:
             console.print(f"Default view: {default_view}", style="green")
@@ -564,32 +678,38 @@ def show_view(
             console.print(msg, style="yellow")
             raise typer.Exit(1)
 
-        # Show view information
-        console.print(f"\n👁️  View: {view.name}", style="bold magenta")
-        if view.description:
-            console.print(f"📝 Description: {view.description}", style="dim")
-
-        # Call the show_database function with the view's parameters
-        show_database(
-            name=view.database_name,
-            limit=view.limit,
-            columns=", ".join(view.columns) if view.columns else None,
-            filter_expr=view.filter_expr,
-            save_view=None,  # Don't save when loading a view
-        )
+        _show_view(view)
 
     except Exception as e:
         console.print(f"❌ Error: {e}", style="red")
         raise typer.Exit(1)
 
 
+def _show_view(view: "DatabaseView", database: dict[str, Any] | None = None) -> None:
+    """Show a saved view, optionally using an already resolved database."""
+    # Show view information
+    console.print(f"\n👁️  View: {view.name}", style="bold magenta")
+    if view.description:
+        console.print(f"📝 Description: {view.description}", style="dim")
+
+    # Render the database with the view's parameters
+    _show_database(
+        view.database_name,
+        view.limit,
+        view.columns,
+        view.filter_expr,
+        None,  # Don't save when loading a view
+        database=database,
+    )
+
+
 @view_app.command("delete")
 def delete_view(
     view_name: str = typer.Argument(..., help="Name of the view to delete"),
 ) -> None:
     """Delete a saved view."""
     try:
-        views_manager = ViewsManager()
+        views_manager = get_views_manager()
 
         if views_manager.delete_view(view_name):
             console.print(f"✅ View '{view_name}' deleted successfully!", style="green")
@@ -641,7 +761,7 @@ def update_view(
 ) -> None:
     """Update an existing saved view with new filters, columns, or limits."""
     try:
-        views_manager = ViewsManager()
+        views_manager = get_views_manager()
         view = views_manager.load_view(view_name)
 
         if not view:
@@ -688,27 +808,43 @@ def update_view(
             raise typer.Exit(1)
 
         # Save the updated view
-        views_manager.save_view(view)
+        views_manager.save_views([view])
 
-        # Show what was updated
-        console.print(f"✅ View '{view_name}' updated successfully!", style="green")
+        # Show what was updated and the updated view details in a single render
+        summary = Text()
+        summary.append(f"✅ View '{view_name}' updated successfully!\n", style="green")
         for update in updates:
-            console.print(f"  • {update}", style="dim")
+            summary.append(f"  • {update}\n", style="dim")
 
-        # Show the updated view details
-        console.print(f"\n📋 Updated view '{view_name}':", style="bold cyan")
+        summary.append(f"\n📋 Updated view '{view_name}':\n", style="bold cyan")
         columns_str = ", ".join(view.columns) if view.columns else "All"
         filter_str = view.filter_expr if view.filter_expr else "None"
         limit_str = str(view.limit) if view.limit else "All"
 
-        console.print(f"  Database: {view.database_name}")
-        console.print(f"  Columns: {columns_str}")
-        console.print(f"  Filter: {filter_str}")
-        console.print(f"  Limit: {limit_str}")
+        summary.append(
+            f"  Database: {view.database_name}\n"
+            f"  Columns: {columns_str}\n"
+            f"  Filter: {filter_str}\n"
+            f"  Limit: {limit_str}",
+        )
+        console.print(summary)
 
-        # Ask if user wants to view the updated results
-        if typer.confirm("\n👀 Show the updated view?"):
-            show_view(view_name)
+        # Ask if user wants to view the updated results, resolving the view's
+        # database in the background while waiting for the answer. A daemon
+        # thread, so declining exits without waiting for the lookup to finish
+        prefetch: Future[dict[str, Any] | None] = Future()
+
+        def resolve_in_background() -> None:
+            try:
+                prefetch.set_result(resolve_database_name(view.database_name, interactive=False))
+            except Exception as e:
+                prefetch.set_exception(e)
+
+        threading.Thread(target=resolve_in_background, daemon=True).start()
+        if not typer.confirm("\n👀 Show the updated view?"):
+            return
+        # Lookup errors are re-raised here and reported below
+        _show_view(view, database=prefetch.result())
 
     except Exception as e:
         console.print(f"❌ Error: {e}", style="red")
@@ -758,7 +894,7 @@ def create_entry(
 
     try:
         database = resolve_database_name(database_name)
-        client = NotionClientWrapper()
+        client = get_client()
 
         if not database:
             console.print(f"❌ Database '{database_name}' not found.", style="red")
@@ -774,20 +910,23 @@ def create_entry(
         console.print(f"🤖 Generating entry for database: {database_name}")
         console.print(f"📝 Prompt: {prompt}")
 
-        # Get LLM service
-        llm_service = get_default_llm_service()
+        # Get LLM service (imported here since litellm is slow to import)
+        from .llm import get_default_llm_service
+
+        llm_service = get_default_llm_service(get_config_manager())
         if model:
             llm_service.config.model = model
 
         # Generate structured data
         with console.status("🧠 Processing with LLM..."):
-            schema = llm_service._create_notion_schema(properties)
+            schema, schema_json = llm_service._create_notion_schema(properties)
             structured_data = llm_service.generate_structured_data(
                 prompt=prompt,
                 schema=schema,
                 context=f"Creating entry in Notion database '{database_name}'",
                 allow_revision=interactive,
                 files=files,
+                schema_json=schema_json,
             )
 
         # Handle file uploads if files were provided
@@ -827,10 +966,7 @@ def create_entry(
 
         for prop_name, value in structured_data.items():
             if value is not None:
-                display_value = str(value)
-                if isinstance(value, list):
-                    display_value = ", ".join(str(v) for v in value)
-                table.add_row(prop_name, display_value)
+                table.add_row(prop_name, _format_summary_value(value))
 
         console.print(table)
 
@@ -892,7 +1028,7 @@ def edit_entries(
 
     try:
         database = resolve_database_name(database_name)
-        client = NotionClientWrapper()
+        client = get_client()
 
         if not database:
             console.print(f"❌ Database '{database_name}' not found.", style="red")
@@ -908,36 +1044,47 @@ def edit_entries(
         console.print(f"🤖 Processing edit request for database: {database_name}")
         console.print(f"📝 Prompt: {prompt}")
 
-        # Get LLM service
-        llm_service = get_default_llm_service()
+        # Get LLM service (imported here since litellm is slow to import)
+        from .llm import get_default_llm_service
+
+        llm_service = get_default_llm_service(get_config_manager())
         if model:
             llm_service.config.model = model
 
-        # Generate filter from prompt
-        with console.status("🧠 Analyzing prompt to find entries..."):
-            filter_expression = llm_service.generate_filters_from_prompt(
+        # Generate the filter and the updates from the prompt in one request
+        with console.status("🧠 Analyzing prompt to find entries and updates..."):
+            filter_expression, update_data = llm_service.generate_filter_and_updates(
                 prompt,
                 properties,
+                files=files if files else None,
             )
 
         console.print(f"🔍 Generated filter: {filter_expression}")
 
         # Parse and apply filter
-        if filter_expression and filter_expression.lower() != "none":
-            try:
-                parser = FilterParser()
-                converter = NotionFilterConverter()
-                parsed_filters = parser.parse(filter_expression)
-                filter_conditions = converter.convert(parsed_filters, properties)
-            except Exception as e:
-                console.print(f"⚠️ Filter parsing failed: {e}", style="yellow")
-                filter_conditions = None
-        else:
-            filter_conditions = None
+        filter_conditions = _compile_generated_filter(filter_expression, properties)
+
+        # Imported here since the client module is only loaded once a command needs it
+        from .client import StaleDatabaseError
 
         # Get entries to edit
-        with console.status("📊 Fetching entries..."):
-            entries = client.get_database_entries(database_id, 10, filter_conditions)
+        try:
+            with console.status("📊 Fetching entries..."):
+                entries = client.get_database_entries(database_id, 10, filter_conditions)
+        except StaleDatabaseError as e:
+            # Only the schema was stale, so look the database up afresh and rerun
+            # the query with the filter and updates already generated
+            console.print(f"⚠️  {e}. Retrying with a fresh lookup...", style="yellow")
+            database = resolve_database_name(database_name)
+            if not database:
+                console.print(f"❌ Database '{database_name}' not found.", style="red")
+                raise typer.Exit(1)
+
+            database_id = database.get("id", "")
+            properties = database.get("properties", {})
+            filter_conditions = _compile_generated_filter(filter_expression, properties)
+            with console.status("📊 Fetching entries..."):
+                entries = client.get_database_entries(database_id, 10, filter_conditions)
 
         if not entries:
             console.print("❌ No entries found matching the criteria.", style="red")
@@ -952,36 +1099,22 @@ def edit_entries(
 
         # Add key columns for identification
         key_columns = ["Name", "Title", "Task"]
-        displayed_columns = []
-        for col in key_columns:
-            if col in properties:
-                table.add_column(col, style="white")
-                displayed_columns.append(col)
-                break
+        key_column = next((col for col in key_columns if col in properties), None)
 
-        for i, entry in enumerate(entries):
-            entry_props = entry.get("properties", {})
-            row = [str(i + 1), entry.get("id", "")[:8] + "..."]
+        # Extract the table column by column, as db show does
+        columns = [[entry.get("id", "")[:8] + "..." for entry in entries]]
+        if key_column:
+            table.add_column(key_column, style="white")
+            entry_properties = [entry.get("properties") or {} for entry in entries]
+            prop_type = properties[key_column].get("type", "")
+            key_values = client.extract_column_values(entry_properties, key_column, prop_type)
+            columns.append([value or "—" for value in key_values])
 
-            for col in displayed_columns:
-                if col in entry_props:
-                    value = client.extract_property_value(entry_props[col])
-                    row.append(value or "—")
-                else:
-                    row.append("—")
-
-            table.add_row(*row)
+        for i, row in enumerate(zip(*columns, strict=True), 1):
+            table.add_row(str(i), *row)
 
         console.print(table)
 
-        # Generate updates
-        with console.status("🧠 Generating updates..."):
-            update_data = llm_service.generate_updates_from_prompt(
-                prompt,
-                properties,
-                files=files if files else None,
-            )
-
         if not update_data:
             console.print("❌ No valid updates generated from prompt.", style="red")
             return
@@ -994,10 +1127,7 @@ def edit_entries(
 
         for prop_name, value in update_data.items():
             if value is not None:
-                display_value = str(value)
-                if isinstance(value, list):
-                    display_value = ", ".join(str(v) for v in value)
-                update_table.add_row(prop_name, display_value)
+                update_table.add_row(prop_name, _format_summary_value(value))
 
         console.print(update_table)
 
@@ -1037,18 +1167,22 @@ def edit_entries(
             properties,
         )
 
-        # Apply updates
-        success_count = 0
+        # Apply updates concurrently
         with console.status("📝 Applying updates..."):
-            for entry in entries:
-                try:
-                    client.update_page(entry["id"], notion_updates)
-                    success_count += 1
-                except Exception as e:
-                    console.print(
-                        f"⚠️ Failed to update entry {entry['id']}: {e}",
-                        style="yellow",
-                    )
+            errors = client.bulk_update_pages(
+                [entry["id"] for entry in entries],
+                notion_updates,
+            )
+
+        success_count = 0
+        for entry, error in zip(entries, errors, strict=True):
+            if error is None:
+                success_count += 1
+            else:
+                console.print(
+                    f"⚠️ Failed to update entry {entry['id']}: {error}",
+                    style="yellow",
+                )
 
         console.print(
             f"✅ Successfully updated {success_count}/{len(entries)} entries!",
@@ -1083,12 +1217,7 @@ def get_database_link(
             raise typer.Exit(1)
 
         # Extract database title
-        title = "Untitled"
-        if "title" in database and database["title"]:
-            if isinstance(database["title"], list) and database["title"]:
-                title = database["title"][0].get("plain_text", "Untitled")
-            elif isinstance(database["title"], str):
-                title = database["title"]
+        title = get_client().get_database_title(database)
 
         # Get database URL
         db_url = database.get("url", "")
@@ -1100,18 +1229,7 @@ def get_database_link(
 
         # Copy to clipboard if requested
         if copy:
-            try:
-                import pyperclip
-
-                pyperclip.copy(db_url)
-                console.print("✅ Link copied to clipboard!", style="green")
-            except ImportError:
-                console.print(
-                    "⚠️ pyperclip not installed. Install with: pip install pyperclip",
-                    style="yellow",
-                )
-            except Exception as e:
-                console.print(f"⚠️ Failed to copy to clipboard: {e}", style="yellow")
+            _copy_to_clipboard(db_url)
 
     except ValueError as e:
         console.print(f"❌ {e}", style="red")
@@ -1155,11 +1273,12 @@ def get_entry_link(
             )
             raise typer.Exit(1)
 
-        client = NotionClientWrapper()
-        entries = client.get_database_entry_by_name(
+        client = get_client()
+        entries, total = client.rank_database_entries_by_name(
             database_name,
             entry_name,
             fuzzy=not exact,
+            limit=limit,
         )
 
         if not entries:
@@ -1174,12 +1293,10 @@ def get_entry_link(
             raise typer.Exit(1)
 
         # If multiple entries found, show them for selection
-        if len(entries) > 1:
-            # Limit results
-            if len(entries) > limit:
-                entries = entries[:limit]
+        if total > 1:
+            if total > limit:
                 console.print(
-                    f"📊 Showing top {limit} results (found {len(entries)} total)",
+                    f"📊 Showing top {limit} results (found {total} total)",
                 )
             else:
                 console.print(
@@ -1214,20 +1331,11 @@ def get_entry_link(
                     if 1 <= choice <= len(entries):
                         entry = entries[choice - 1]
                         urls = client.get_entry_urls(entry)
-
-                        import pyperclip
-
-                        pyperclip.copy(urls["private"])
-                        console.print("✅ Link copied to clipboard!", style="green")
+                        _copy_to_clipboard(urls["private"])
                     else:
                         console.print("❌ Invalid choice.", style="red")
                 except (typer.Abort, ValueError):
                     console.print("❌ Copy cancelled.", style="yellow")
-                except ImportError:
-                    console.print(
-                        "⚠️ pyperclip not installed. Install with: pip install pyperclip",
-                        style="yellow",
-                    )
         else:
             # Single entry - show details and copy if requested
             entry = entries[0]
@@ -1242,18 +1350,7 @@ def get_entry_link(
 
             # Copy to clipboard if requested
             if copy:
-                try:
-                    import pyperclip
-
-                    pyperclip.copy(urls["private"])
-                    console.print("✅ Link copied to clipboard!", style="green")
-                except ImportError:
-                    console.print(
-                        "⚠️ pyperclip not installed. Install with: pip install pyperclip",
-                        style="yellow",
-                    )
-                except Exception as e:
-                    console.print(f"⚠️ Failed to copy to clipboard: {e}", style="yellow")
+                _copy_to_clipboard(urls["private"])
 
     except ValueError as e:
         console.print(f"❌ {e}", style="red")
@@ -1270,24 +1367,20 @@ def get_entry_link(
 def list_pages() -> None:
     """List all accessible pages."""
     try:
-        client = NotionClientWrapper()
-        pages = client.search_pages()
-
-        if not pages:
-            console.print("No pages found.", style="yellow")
-            return
+        client = get_client()
 
         table = Table(title="Notion Pages")
         table.add_column("Name", style="cyan")
         table.add_column("ID", style="magenta")
         table.add_column("URL", style="blue")
 
-        for page in pages:
-            title = client._extract_page_title(page)
-            page_id = page.get("id", "")
-            page_url = page.get("url", "")
+        # Add rows as each batch of search results arrives
+        for page in client.iter_search_pages():
+            table.add_row(client._extract_page_title(page), page.get("id", ""), page.get("url", ""))
 
-            table.add_row(title, page_id, page_url)
+        if not table.row_count:
+            console.print("No pages found.", style="yellow")
+            return
 
         console.print(table)
 
@@ -1317,21 +1410,21 @@ def find_page(
 ) -> None:
     """Find pages by name and show their links."""
     try:
-        client = NotionClientWrapper()
-        pages = client.get_page_by_name(name, fuzzy=not exact)
+        client = get_client()
+        pages, total = client.rank_pages_by_name(name, fuzzy=not exact, limit=limit)
 
         if not pages:
             console.print(f"❌ No pages found matching '{name}'.", style="red")
             console.print("Use 'notion page list' to see all pages.", style="yellow")
             raise typer.Exit(1)
 
-        # Limit results
-        if len(pages) > limit:
-            pages = pages[:limit]
-            console.print(f"📄 Showing top {limit} results (found {len(pages)} total)")
+        if total > limit:
+            console.print(f"📄 Showing top {limit} results (found {total} total)")
         else:
             console.print(f"📄 Found {len(pages)} page(s) matching '{name}'")
 
+        # Collect every result into one Text so the listing is written at once
+        results = Text()
         for i, page in enumerate(pages, 1):
             title = page.get("_title", "Untitled")
             match_score = page.get("_match_score", 0)
@@ -1340,15 +1433,18 @@ def find_page(
             # Get URLs
             urls = client.get_page_urls(page)
 
-            console.print(f"\n{i}. {title}", style="bold cyan")
-            console.print(f"   Match Score: {match_score:.2f}", style="dim")
-            console.print(f"   Page ID: {page_id}", style="dim")
-            console.print(f"   Private URL: {urls['private']}", style="blue")
+            results.append(f"\n{i}. {title}\n", style="bold cyan")
+            results.append(f"   Match Score: {match_score:.2f}\n", style="dim")
+            results.append(f"   Page ID: {page_id}\n", style="dim")
+            results.append(f"   Private URL: {urls['private']}\n", style="blue")
 
             if urls["public"]:
-                console.print(f"   Public URL: {urls['public']}", style="green")
+                results.append(f"   Public URL: {urls['public']}\n", style="green")
             else:
-                console.print("   Public URL: Not shared publicly", style="yellow")
+                results.append("   Public URL: Not shared publicly\n", style="yellow")
+
+        results.rstrip()
+        console.print(results)
 
     except ValueError as e:
         console.print(f"❌ {e}", style="red")
@@ -1383,7 +1479,7 @@ def create_page(
 ) -> None:
     """Create a new page from a local file."""
     try:
-        client = NotionClientWrapper()
+        client = get_client()
 
         # Determine the parent page
         parent_id = None
@@ -1391,7 +1487,8 @@ def create_page(
             parent_id = parent_page_id
         elif parent_page_name:
             with console.status(f"Searching for parent page '{parent_page_name}'..."):
-                pages = client.get_page_by_name(parent_page_name)
+                # Two results are enough to tell whether the name is ambiguous
+                pages = client.get_page_by_name(parent_page_name, limit=2)
                 if not pages:
                     console.print(
                         f"❌ Parent page '{parent_page_name}' not found.",
@@ -1416,44 +1513,42 @@ def create_page(
                 if not typer.confirm("Create as a top-level page?"):
                     raise typer.Exit()
             else:
-                # Sort pages alphabetically by title before creating choices
-                all_pages.sort(key=lambda page: client._extract_page_title(page))
-
-                page_choices = [
+                # Map titles to page IDs, offering the no-parent option first and
+                # the rest alphabetically; duplicate titles keep the first match
+                page_choices: dict[str, str | None] = {"No parent (top-level page)": None}
+                for title, pid in sorted(
                     (client._extract_page_title(page), page["id"]) for page in all_pages
-                ]
-                # Add an option for no parent
-                page_choices.insert(0, ("No parent (top-level page)", None))
+                ):
+                    page_choices.setdefault(title, pid)
+
+                import questionary
 
                 selected_title = questionary.autocomplete(
                     "Select a parent page (start typing to filter):",
-                    choices=[title for title, _ in page_choices],
+                    choices=list(page_choices),
                 ).ask()
 
                 if selected_title is None:
                     console.print("No parent page selected. Aborting.", style="yellow")
                     raise typer.Exit()
 
-                # Find the id corresponding to the selected title
-                for title, pid in page_choices:
-                    if title == selected_title:
-                        parent_id = pid
-                        break
+                parent_id = page_choices.get(selected_title)
 
         # Read and convert the file content
         with console.status("Converting file to Notion format..."):
-            with open(filepath, encoding="utf-8") as f:
-                md_content = f.read()
+            md_content = filepath.read_text(encoding="utf-8")
 
             # Extract title from the first H1, or use the filename
             page_title = filepath.stem
-            if md_content.strip().startswith("# "):
-                title_line = md_content.strip().splitlines()[0]
+            stripped_content = md_content.strip()
+            if stripped_content.startswith("# "):
+                # Split off only the title line instead of splitting every line
+                title_line, _, md_content = stripped_content.partition("\n")
                 page_title = title_line.lstrip("# ").strip()
-                # Remove title from content
-                md_content = "\n".join(md_content.strip().splitlines()[1:])
 
             # Convert markdown to Notion blocks
+            from md2notionpage.core import parse_md
+
             children = parse_md(md_content)
 
         # Create the page
@@ -1492,8 +1587,8 @@ def get_page_link(
 ) -> None:
     """Get the link for a specific page."""
     try:
-        client = NotionClientWrapper()
-        pages = client.get_page_by_name(name, fuzzy=True)
+        client = get_client()
+        pages = client.get_page_by_name(name, fuzzy=True, limit=1)
 
         if not pages:
             console.print(f"❌ No pages found matching '{name}'.", style="red")
@@ -1522,18 +1617,7 @@ def get_page_link(
 
         # Copy to clipboard if requested
         if copy:
-            try:
-                import pyperclip
-
-                pyperclip.copy(url_to_copy)
-                console.print("✅ Link copied to clipboard!", style="green")
-            except ImportError:
-                console.print(
-                    "⚠️ pyperclip not installed. Install with: pip install pyperclip",
-                    style="yellow",
-                )
-            except Exception as e:
-                console.print(f"⚠️ Failed to copy to clipboard: {e}", style="yellow")
+            _copy_to_clipboard(url_to_copy)
 
     except ValueError as e:
         console.print(f"❌ {e}", style="red")
@@ -1543,13 +1627,25 @@ def get_page_link(
         raise typer.Exit(1)
 
 
+# Cache commands
+
+
+@cache_app.command("clear")
+def clear_cache() -> None:
+    """Clear cached database lookups, search results and LLM responses."""
+    try:
+        config_manager = get_config_manager()
+        config_manager.clear_cache()
+        console.print("✅ Cache cleared.", style="green")
+    except Exception as e:
+        console.print(f"❌ Error clearing cache: {e}", style="red")
+        raise typer.Exit(1)
+
+
 # Shell completion commands
 
 
-def generate_completion_script(shell: str) -> str:
-    """Generate completion script for the specified shell."""
-    if shell == "bash":
-        return """
+_BASH_COMPLETION = """
 # Bash completion for notion
 _notion_completion() {
     local cur prev opts
@@ -1559,7 +1655,7 @@ _notion_completion() {
 
     # Main commands
     if [[ ${COMP_CWORD} == 1 ]]; then
-        opts="auth db view page completion version --help"
+        opts="auth db view page completion cache version --help"
         COMPREPLY=( $(compgen -W "${opts}" -- ${cur}) )
         return 0
     fi
@@ -1581,6 +1677,9 @@ _notion_completion() {
         completion)
             opts="install show uninstall"
             ;;
+        cache)
+            opts="clear"
+            ;;
         *)
             return 0
             ;;
@@ -1592,8 +1691,8 @@ _notion_completion() {
 
 complete -F _notion_completion notion
 """
-    elif shell == "zsh":
-        return """
+
+_ZSH_COMPLETION = """
 #compdef notion
 
 _notion() {
@@ -1611,6 +1710,7 @@ _notion() {
                 "view[View management commands]" \\
                 "page[Page management commands]" \\
                 "completion[Shell completion commands]" \\
+                "cache[Cache management commands]" \\
                 "version[Show version]"
             ;;
         args)
@@ -1648,6 +1748,10 @@ _notion() {
                         "show[Show completion script]" \\
                         "uninstall[Uninstall completion]"
                     ;;
+                cache)
+                    _values "cache command" \\
+                        "clear[Clear cached database lookups]"
+                    ;;
             esac
             ;;
     esac
@@ -1655,8 +1759,8 @@ _notion() {
 
 _notion "$@"
 """
-    elif shell == "fish":
-        return """
+
+_FISH_COMPLETION = """
 # Fish completion for notion
 
 # Main commands
@@ -1665,6 +1769,7 @@ complete -c notion -f -n "__fish_use_subcommand" -a "db" -d "Database commands"
 complete -c notion -f -n "__fish_use_subcommand" -a "view" -d "View management commands"
 complete -c notion -f -n "__fish_use_subcommand" -a "page" -d "Page management commands"
 complete -c notion -f -n "__fish_use_subcommand" -a "completion" -d "Shell completion commands"
+complete -c notion -f -n "__fish_use_subcommand" -a "cache" -d "Cache management commands"
 complete -c notion -f -n "__fish_use_subcommand" -a "version" -d "Show version"
 
 # Auth subcommands
@@ -1695,12 +1800,15 @@ complete -c notion -f -n "__fish_seen_subcommand_from completion" -a "install" -
 complete -c notion -f -n "__fish_seen_subcommand_from completion" -a "show" -d "Show completion script"
 complete -c notion -f -n "__fish_seen_subcommand_from completion" -a "uninstall" -d "Uninstall completion"
 
+# Cache subcommands
+complete -c notion -f -n "__fish_seen_subcommand_from cache" -a "clear" -d "Clear cached database lookups"
+
 # Common options
 complete -c notion -l help -d "Show help"
 complete -c notion -s h -l help -d "Show help"
 """
-    elif shell == "powershell":
-        return """
+
+_POWERSHELL_COMPLETION = """
 # PowerShell completion for notion
 
 Register-ArgumentCompleter -CommandName notion -ScriptBlock {
@@ -1712,6 +1820,7 @@ Register-ArgumentCompleter -CommandName notion -ScriptBlock {
         'view' = @('list', 'show', 'update', 'delete')
         'page' = @('list', 'find', 'link')
         'completion' = @('install', 'show', 'uninstall')
+        'cache' = @('clear')
         'version' = @()
     }
 
@@ -1731,8 +1840,21 @@ Register-ArgumentCompleter -CommandName notion -ScriptBlock {
     }
 }
 """
-    else:
-        raise ValueError(f"Unsupported shell: {shell}")
+
+_COMPLETION_SCRIPTS = {
+    "bash": _BASH_COMPLETION,
+    "zsh": _ZSH_COMPLETION,
+    "fish": _FISH_COMPLETION,
+    "powershell": _POWERSHELL_COMPLETION,
+}
+
+
+def generate_completion_script(shell: str) -> str:
+    """Generate completion script for the specified shell."""
+    try:
+        return _COMPLETION_SCRIPTS[shell]
+    except KeyError:
+        raise ValueError(f"Unsupported shell: {shell}") from None
 
 
 @completion_app.command("install")
@@ -1747,7 +1869,7 @@ def install_completion(
     """Install shell completion for notion."""
 
     # Validate shell type
-    valid_shells = ["bash", "zsh", "fish", "powershell"]
+    valid_shells = list(_COMPLETION_SCRIPTS)
     if shell not in valid_shells:
         console.print(f"❌ Unsupported shell: {shell}", style="red")
         console.print(f"Supported shells: {', '.join(valid_shells)}", style="yellow")
@@ -1782,15 +1904,6 @@ def install_completion(
 
 def install_bash_completion(completion_script: str) -> None:
     """Install bash completion."""
-    from pathlib import Path
-
-    # Try common bash completion directories
-    [
-        Path.home() / ".bash_completion.d",
-        Path("/usr/local/etc/bash_completion.d"),
-        Path("/etc/bash_completion.d"),
-    ]
-
     # Create user completion directory if it doesn't exist
     user_dir = Path.home() / ".bash_completion.d"
     user_dir.mkdir(exist_ok=True)
@@ -1809,8 +1922,6 @@ def install_bash_completion(completion_script: str) -> None:
 
 def install_zsh_completion(completion_script: str) -> None:
     """Install zsh completion."""
-    from pathlib import Path
-
     # Check if using oh-my-zsh
     oh_my_zsh_dir = Path.home() / ".oh-my-zsh"
     if oh_my_zsh_dir.exists():
@@ -1846,8 +1957,6 @@ def install_zsh_completion(completion_script: str) -> None:
 
 def install_fish_completion(completion_script: str) -> None:
     """Install fish completion."""
-    from pathlib import Path
-
     # Fish completion directory
     completion_dir = Path.home() / ".config" / "fish" / "completions"
     completion_dir.mkdir(parents=True, exist_ok=True)
@@ -1889,8 +1998,6 @@ def uninstall_completion(
     shell: str = typer.Argument(..., help="Shell type: bash, zsh, fish, or powershell"),
 ) -> None:
     """Uninstall shell completion for notion."""
-    from pathlib import Path
-
     try:
         if shell == "bash":
             completion_file = Path.home() / ".bash_completion.d" / "notion"
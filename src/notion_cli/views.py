@@ -1,11 +1,13 @@
 """Views management for saving and loading database views."""
 
 import json
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 from pathlib import Path
 
 from platformdirs import user_config_dir
 
+from .config import write_file_atomically
+
 
 @dataclass
 class DatabaseView:
@@ -30,13 +32,21 @@ class ViewsManager:
             config_dir = Path(user_config_dir("notion", "notion"))
             self.views_path = config_dir / "views.json"
 
+        # Views loaded from the file, kept so lookups do not re-read it
+        self._views: dict[str, DatabaseView] | None = None
+
         # Ensure the directory exists
         self.views_path.parent.mkdir(parents=True, exist_ok=True)
 
     def save_view(self, view: DatabaseView) -> None:
         """Save a view to the views file."""
+        self.save_views([view])
+
+    def save_views(self, views_to_save: list[DatabaseView]) -> None:
+        """Save several views with a single rewrite of the views file."""
         views = self.load_all_views()
-        views[view.name] = view
+        for view in views_to_save:
+            views[view.name] = view
         self._write_views(views)
 
     def load_view(self, view_name: str) -> DatabaseView | None:
@@ -115,6 +125,13 @@ class ViewsManager:
 
     def load_all_views(self) -> dict[str, DatabaseView]:
         """Load all views from the views file."""
+        if self._views is None:
+            self._views = self._read_views()
+        # Hand out a copy so callers can modify it before writing it back
+        return dict(self._views)
+
+    def _read_views(self) -> dict[str, DatabaseView]:
+        """Read views from the views file."""
         if not self.views_path.exists():
             return {}
 
@@ -146,9 +163,9 @@ class ViewsManager:
 
     def _write_views(self, views: dict[str, DatabaseView]) -> None:
         """Write views to the views file."""
-        data = {}
-        for name, view in views.items():
-            data[name] = asdict(view)
+        # json.dump only reads the fields, so skip asdict's recursive deep copy
+        data = {name: vars(view) for name, view in views.items()}
 
-        with open(self.views_path, "w") as f:
-            json.dump(data, f, indent=2)
+        # Swap in a complete file so readers never see a partial one
+        write_file_atomically(self.views_path, json.dumps(data, indent=2).encode())
+        self._views = dict(views)